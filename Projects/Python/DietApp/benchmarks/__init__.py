@@ -0,0 +1 @@
+"""Замеры производительности решателей (запуск: python -m benchmarks.run)"""
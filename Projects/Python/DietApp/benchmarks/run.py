@@ -0,0 +1,238 @@
+"""
+Замеры времени и качества решателей на синтетических каталогах.
+
+    python -m benchmarks.run                      # полный набор -> benchmarks/results.json
+    python -m benchmarks.run --quick -o new.json  # маленькие каталоги
+    python -m benchmarks.run --compare old.json new.json
+
+Результаты пишутся в JSON с отсортированными ключами, чтобы файлы разных
+версий можно было сравнивать diff'ом или через --compare.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional, Tuple
+from models.dish import Dish, DietTarget, DietTolerance, MealStructure
+from solver.diet_solver import HeuristicDietSolver
+from solver.local_search import deviation_bounds, day_penalty
+from solver.preprocess import meal_combinations
+from solver.pulp_solver import PulpDietSolver, PULP_AVAILABLE
+from solver.vectorized import NUMPY_AVAILABLE, NUTRIENT_KEYS
+
+
+SIZES = (50, 500, 5000, 50000)
+QUICK_SIZES = (50, 200)
+STRUCTURES = {
+    "3x1-2": MealStructure(num_meals=3, min_dishes_per_meal=1, max_dishes_per_meal=2),
+    "3x1-3": MealStructure(num_meals=3, min_dishes_per_meal=1, max_dishes_per_meal=3),
+    "5x1-1": MealStructure(num_meals=5, min_dishes_per_meal=1, max_dishes_per_meal=1),
+}
+TOLERANCES = {
+    "default": DietTolerance(),
+    "tight": DietTolerance(calories=3, proteins=3, fats=3, carbs=3, price=10),
+}
+# Эвристика перебирает все сочетания: больше - случай пропускается
+MAX_COMBINATIONS = 20_000_000
+# Ограничение времени CBC (сек): без него PuLP на 200+ блюдах считает минутами
+PULP_TIME_LIMIT = 10.0
+# Отклонение времени, которое --compare считает регрессией
+REGRESSION_RATIO = 1.25
+
+# Профили блюд: (калории, доля белков, жиров, углеводов по калориям, цена за 100 ккал)
+_PROFILES = (
+    ((150, 450), (0.35, 0.45, 0.20), (40, 90)),   # мясо, рыба
+    ((200, 600), (0.12, 0.28, 0.60), (10, 30)),   # гарниры, выпечка
+    ((30, 150), (0.20, 0.10, 0.70), (20, 60)),    # овощи, фрукты
+    ((100, 350), (0.25, 0.40, 0.35), (25, 70)),   # молочные продукты
+)
+
+
+def synthetic_catalog(n: int, seed: int = 0) -> List[Dish]:
+    """Каталог из n блюд с правдоподобным соотношением БЖУ и цен"""
+    rng = random.Random(seed)
+    dishes = []
+    for i in range(n):
+        (cal_lo, cal_hi), shares, (price_lo, price_hi) = rng.choice(_PROFILES)
+        calories = rng.uniform(cal_lo, cal_hi)
+        p, f, c = (share * rng.uniform(0.7, 1.3) for share in shares)
+        total = p + f + c
+        dishes.append(Dish(
+            name=f"Блюдо {i}",
+            calories=round(calories, 1),
+            proteins=round(calories * p / total / 4, 1),
+            fats=round(calories * f / total / 9, 1),
+            carbs=round(calories * c / total / 4, 1),
+            price=round(calories / 100 * rng.uniform(price_lo, price_hi), 2),
+            weight=round(rng.uniform(80, 350))
+        ))
+    return dishes
+
+
+def _timed(phases: Dict[str, float], name: str, func, *args, **kwargs):
+    started = time.perf_counter()
+    value = func(*args, **kwargs)
+    phases[name] = round(time.perf_counter() - started, 4)
+    return value
+
+
+def _quality(result: Dict[str, Any], target: DietTarget,
+             tolerance: DietTolerance) -> Dict[str, Any]:
+    """
+    Качество одинаково для всех решателей: штраф дня по калориям и БЖУ
+    (как в эвристике), цена и укладывается ли она в бюджет. Цена в штраф
+    не входит - PuLP её минимизирует, и дешёвый план не должен считаться хуже.
+    """
+    if result.get('status') != 'success':
+        return {"status": result.get('status'), "score": None, "price": None, "price_ok": None}
+    daily = result['daily_totals']
+    totals = [daily[key]['actual'] if key in daily else 0.0 for key in NUTRIENT_KEYS]
+    bounds = [b for b in deviation_bounds(target.to_dict(), tolerance.to_dict())
+              if NUTRIENT_KEYS[b[0]] != 'price']
+    return {
+        "status": "success",
+        "score": round(day_penalty(totals, bounds), 4),
+        "price": result['total_price'],
+        "price_ok": result['total_price'] <= target.price * (1 + tolerance.price / 100) + 1e-6,
+    }
+
+
+def bench_heuristic(dishes: List[Dish], target: DietTarget, tolerance: DietTolerance,
+                    structure: MealStructure, assembly: str = "sample") -> Tuple[Dict, Dict]:
+    """Эвристика по фазам solve(): варианты приёмов пищи, сборка дня, форматирование"""
+    phases: Dict[str, float] = {}
+    solver = _timed(phases, "init", HeuristicDietSolver, dishes, assembly=assembly)
+    if not _timed(phases, "meals", solver._prepare_meals, target, structure):
+        return phases, {"status": "error"}
+    day = _timed(phases, "search", solver._search_day, target, tolerance, structure)
+    result = _timed(phases, "format", solver._format_result, day, target, tolerance)
+    return phases, result
+
+
+def bench_pulp(dishes: List[Dish], target: DietTarget, tolerance: DietTolerance,
+               structure: MealStructure, time_limit: Optional[float] = PULP_TIME_LIMIT) -> Tuple[Dict, Dict]:
+    """PuLP по фазам: построение модели, решение CBC с форматированием"""
+    phases: Dict[str, float] = {}
+    solver = _timed(phases, "init", PulpDietSolver, dishes, time_limit=time_limit)
+    _timed(phases, "model", solver._prepare_model, target, tolerance, structure)
+    result = _timed(phases, "solve", solver._solve_current, target, tolerance, structure)
+    return phases, result
+
+
+def run_suite(sizes=SIZES, structures=None, tolerances=None, seed: int = 0,
+              max_combinations: int = MAX_COMBINATIONS,
+              pulp_time_limit: Optional[float] = PULP_TIME_LIMIT, log=print) -> Dict[str, Any]:
+    """Прогоняет все сочетания параметров и возвращает отчёт"""
+    structures = structures or STRUCTURES
+    tolerances = tolerances or TOLERANCES
+    target = DietTarget()
+    solvers = [("heuristic", bench_heuristic)]
+    if NUMPY_AVAILABLE:
+        solvers.append(("heuristic_dp", lambda *a: bench_heuristic(*a, assembly="dp")))
+    if PULP_AVAILABLE:
+        solvers.append(("pulp", lambda *a: bench_pulp(*a, time_limit=pulp_time_limit)))
+
+    cases = []
+    for n in sizes:
+        dishes = synthetic_catalog(n, seed)
+        for s_name, structure in structures.items():
+            for t_name, tolerance in tolerances.items():
+                for solver_name, bench in solvers:
+                    case = {
+                        "solver": solver_name,
+                        "dishes": n,
+                        "structure": s_name,
+                        "tolerance": t_name,
+                    }
+                    combos = meal_combinations(n, structure)
+                    if solver_name.startswith("heuristic") and combos > max_combinations:
+                        case["skipped"] = f"{combos} вариантов приёма пищи"
+                        cases.append(case)
+                        continue
+
+                    started = time.perf_counter()
+                    phases, result = bench(dishes, target, tolerance, structure)
+                    case["total"] = round(time.perf_counter() - started, 4)
+                    case["phases"] = phases
+                    case.update(_quality(result, target, tolerance))
+                    cases.append(case)
+                    log(f"{solver_name:13} {n:6} {s_name:6} {t_name:8} "
+                        f"{case['total']:8.3f} с  штраф {case['score']}")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": NUMPY_AVAILABLE,
+            "pulp": PULP_AVAILABLE,
+            "seed": seed,
+            "pulp_time_limit": pulp_time_limit,
+            "target": asdict(target),
+            "structures": {k: asdict(v) for k, v in structures.items()},
+            "tolerances": {k: asdict(v) for k, v in tolerances.items()},
+        },
+        "results": cases,
+    }
+
+
+def _case_key(case: Dict[str, Any]) -> tuple:
+    return case["solver"], case["dishes"], case["structure"], case["tolerance"]
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any],
+            ratio: float = REGRESSION_RATIO) -> List[str]:
+    """Список регрессий: медленнее в ratio раз или хуже штраф"""
+    previous = {_case_key(c): c for c in old["results"]}
+    problems = []
+    for case in new["results"]:
+        before = previous.get(_case_key(case))
+        if before is None or "total" not in before or "total" not in case:
+            continue
+        name = "/".join(str(part) for part in _case_key(case))
+        if case["total"] > before["total"] * ratio and case["total"] - before["total"] > 0.05:
+            problems.append(f"{name}: время {before['total']} -> {case['total']} с")
+        if before.get("score") is not None and (
+                case.get("score") is None or case["score"] > before["score"] + 1e-6):
+            problems.append(f"{name}: штраф {before['score']} -> {case.get('score')}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры решателей диеты")
+    parser.add_argument("-o", "--output", default="benchmarks/results.json",
+                        help="Файл для результатов (JSON)")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Размеры каталогов")
+    parser.add_argument("--quick", action="store_true", help="Только маленькие каталоги")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-combinations", type=int, default=MAX_COMBINATIONS)
+    parser.add_argument("--pulp-time-limit", type=float, default=PULP_TIME_LIMIT,
+                        help="Ограничение времени CBC на один расчёт, сек")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="Сравнить два файла результатов и вывести регрессии")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            new = json.load(f)
+        problems = compare(old, new)
+        for line in problems:
+            print(line)
+        print(f"Регрессий: {len(problems)}")
+        return 1 if problems else 0
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    report = run_suite(sizes, seed=args.seed, max_combinations=args.max_combinations,
+                       pulp_time_limit=args.pulp_time_limit)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"Результаты сохранены в {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Консольный (без GUI) пакетный расчёт диет.
+
+    python cli.py dishes.json targets.json -o results.jsonl --method pulp --workers 4
+
+Каталог блюд - JSON-файл в формате приложения, файл целей - JSON-массив
+или JSON Lines с профилями:
+
+    {"id": "user-1", "target": {"calories": 1800, "proteins_pct": 30},
+     "tolerance": {"price": 10}}
+
+Результаты пишутся в JSON Lines по мере готовности, по строке на профиль:
+{"index", "id", "elapsed", "result"}. tkinter не импортируется.
+"""
+import argparse
+import json
+import sys
+from typing import List, Dict, Any, Optional, Tuple
+from data.loader import DataLoader
+from models.dish import DietTarget, DietTolerance, MealStructure
+from solver.batch import solve_batch
+from solver.factory import SolverFactory
+
+
+def parse_profile(data: Dict[str, Any], index: int) -> Tuple[Any, DietTarget, DietTolerance]:
+    """
+    Профиль из записи файла целей.
+
+    Returns: (id профиля - поле "id" или номер записи, цель, допуски)
+    """
+    target, tolerance = DataLoader.parse_target(data, f"Профиль {index + 1}")
+    return data.get('id', index), target, tolerance
+
+
+def load_profiles(path: str) -> List[Tuple[Any, DietTarget, DietTolerance]]:
+    """Читает файл целей: JSON-массив профилей или JSON Lines"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    try:
+        if text.lstrip().startswith('['):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Ошибка JSON в {path}: {e}") from e
+    return [parse_profile(record, i) for i, record in enumerate(records)]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    default = MealStructure()
+    parser = argparse.ArgumentParser(description="Пакетный расчёт диет без интерфейса")
+    parser.add_argument("catalog", help="Каталог блюд (JSON)")
+    parser.add_argument("targets", help="Профили: JSON-массив или JSON Lines")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Файл результатов JSON Lines ('-' - stdout)")
+    parser.add_argument("--method", choices=sorted(SolverFactory.METHOD_NAMES),
+                        help="Метод решения (по умолчанию - выбор SolverFactory)")
+    parser.add_argument("--no-pulp", action="store_true",
+                        help="Не предпочитать PuLP при автоматическом выборе")
+    parser.add_argument("--time-limit", type=float,
+                        help="Ограничение времени одного расчёта, сек (PuLP, bnb)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Число процессов (0 - по числу ядер)")
+    parser.add_argument("--meals", type=int, default=default.num_meals)
+    parser.add_argument("--min-dishes", type=int, default=default.min_dishes_per_meal)
+    parser.add_argument("--max-dishes", type=int, default=default.max_dishes_per_meal)
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Не использовать двоичный снимок каталога")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Returns: 0 - все профили решены, 1 - есть ошибки расчёта,
+             2 - ошибка входных данных
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        structure = DataLoader.parse_structure({
+            "num_meals": args.meals,
+            "min_dishes_per_meal": args.min_dishes,
+            "max_dishes_per_meal": args.max_dishes,
+        }, "Структура питания")
+        profiles = load_profiles(args.targets)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    catalog, report = DataLoader.load_catalog_from_file(args.catalog,
+                                                        use_snapshot=not args.no_snapshot)
+    if report.fatal is not None or not len(catalog):
+        print(report.fatal or "Каталог блюд пуст", file=sys.stderr)
+        return 2
+    print(report.summary(), file=sys.stderr)
+
+    # Воркеры открывают снимок каталога сами, а не получают блюда через pickle
+    workers = args.workers or None
+    dishes = catalog if workers == 1 or args.no_snapshot else args.catalog
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    failed = 0
+    try:
+        for item in solve_batch(dishes, [(t, tol) for _, t, tol in profiles], structure,
+                                prefer_pulp=not args.no_pulp, workers=workers,
+                                method=args.method, time_limit=args.time_limit):
+            result = item["result"]
+            if result.get("status") != "success":
+                failed += 1
+            line = {"index": item["index"], "id": profiles[item["index"]][0],
+                    "elapsed": item["elapsed"], "result": result}
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Профилей: {len(profiles)}, с ошибкой: {failed}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
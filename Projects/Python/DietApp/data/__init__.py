@@ -1,3 +1,3 @@
-from .loader import DataLoader
+from .loader import DataLoader, LoadReport
 
-__all__ = ['DataLoader']
\ No newline at end of file
+__all__ = ['DataLoader', 'LoadReport']
\ No newline at end of file
@@ -1,11 +1,78 @@
+import codecs
 import json
-from typing import List, Tuple, Optional
-from models.dish import Dish
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Tuple, Optional, Iterator, Union, BinaryIO
+from models.dish import Dish, DietTarget, DietTolerance, MealStructure
+from models.catalog import DishCatalog
+from .snapshot import read_snapshot, write_snapshot
+
+
+@dataclass
+class LoadReport:
+    """Итоги потоковой загрузки каталога"""
+    items: int = 0                # Сколько элементов массива разобрано
+    loaded: int = 0               # Сколько из них стали блюдами
+    error_count: int = 0          # Сколько элементов отброшено
+    errors: List[str] = field(default_factory=list)  # Первые max_errors сообщений
+    fatal: Optional[str] = None   # Ошибка синтаксиса, на которой разбор остановлен
+    bytes_read: int = 0
+    elapsed: float = 0.0
+    max_errors: int = 1000
+    snapshot: bool = False        # Каталог взят из двоичного снимка
+
+    def add_error(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(message)
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_read / 1e6 / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Краткий отчёт для пользователя"""
+        text = (f"Загружено {self.loaded} из {self.items} блюд за {self.elapsed:.2f} с "
+                f"({self.items_per_second:.0f} блюд/с, {self.mb_per_second:.1f} МБ/с)")
+        if self.error_count:
+            text += f", отброшено {self.error_count}"
+        if self.fatal:
+            text += f". Разбор остановлен: {self.fatal}"
+        if self.snapshot:
+            text += " (из снимка)"
+        return text
 
 
 class DataLoader:
     """Класс для загрузки и валидации данных"""
 
+    # Размер блока чтения при потоковой загрузке (байт)
+    CHUNK_SIZE = 1 << 16
+    # Сколько символов может занимать один элемент массива
+    MAX_ITEM_SIZE = 1 << 20
+
+    @staticmethod
+    def _validate_item(i: int, item) -> Tuple[Optional[Dish], Optional[str]]:
+        """Проверяет элемент массива и создаёт из него блюдо"""
+        if not isinstance(item, dict):
+            return None, f"Элемент {i} не является объектом"
+
+        # Проверка обязательных полей
+        required_fields = ['name', 'calories']
+        for field_name in required_fields:
+            if field_name not in item:
+                return None, f"В элементе {i} отсутствует поле '{field_name}'"
+
+        try:
+            return Dish.from_dict(item), None
+        except (ValueError, TypeError) as e:
+            return None, f"Ошибка в элементе {i}: {str(e)}"
+
     @staticmethod
     def load_dishes_from_json(json_str: str) -> Tuple[Optional[List[Dish]], Optional[str]]:
         """
@@ -23,20 +90,10 @@ class DataLoader:
             
             dishes = []
             for i, item in enumerate(data):
-                if not isinstance(item, dict):
-                    return None, f"Элемент {i} не является объектом"
-                
-                # Проверка обязательных полей
-                required_fields = ['name', 'calories']
-                for field in required_fields:
-                    if field not in item:
-                        return None, f"В элементе {i} отсутствует поле '{field}'"
-                
-                try:
-                    dish = Dish.from_dict(item)
-                    dishes.append(dish)
-                except (ValueError, TypeError) as e:
-                    return None, f"Ошибка в элементе {i}: {str(e)}"
+                dish, error = DataLoader._validate_item(i, item)
+                if error:
+                    return None, error
+                dishes.append(dish)
             
             if not dishes:
                 return None, "Список блюд пуст"
@@ -48,6 +105,193 @@ class DataLoader:
         except Exception as e:
             return None, f"Неизвестная ошибка: {str(e)}"
 
+    @staticmethod
+    def iter_dishes(source: Union[str, BinaryIO], report: Optional[LoadReport] = None,
+                    chunk_size: Optional[int] = None) -> Iterator[Dish]:
+        """
+        Потоковая загрузка JSON-массива блюд.
+
+        Файл читается блоками по chunk_size байт, элементы массива разбираются
+        по одному (json.JSONDecoder.raw_decode), и блюдо выдаётся сразу после
+        разбора. В памяти одновременно находятся только текущий блок и
+        выданное блюдо. Некорректные элементы не прерывают загрузку: ошибки
+        копятся в report. Ошибка синтаксиса JSON останавливает разбор
+        (report.fatal), так как место следующего элемента уже не определить.
+
+        Args:
+            source: Путь к файлу или файл, открытый в двоичном режиме
+            report: Отчёт, который заполняется по ходу загрузки
+            chunk_size: Размер блока чтения (по умолчанию CHUNK_SIZE)
+        """
+        if report is None:
+            report = LoadReport()
+        if isinstance(source, str):
+            with open(source, 'rb') as stream:
+                yield from DataLoader.iter_dishes(stream, report, chunk_size)
+            return
+
+        chunk_size = chunk_size or DataLoader.CHUNK_SIZE
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        started = time.perf_counter()
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            """Дочитывает блок в buf; False - файл закончился"""
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            data = source.read(chunk_size)
+            report.bytes_read += len(data)
+            eof = not data
+            buf = buf[pos:] + text_decoder.decode(data, final=eof)
+            pos = 0
+            return not eof
+
+        def skip_ws() -> bool:
+            """Пропускает пробелы; False - файл закончился"""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf):
+                    return True
+                if not fill():
+                    return False
+
+        try:
+            if not skip_ws() or buf[pos] != '[':
+                report.fatal = "JSON должен содержать список блюд"
+                return
+            pos += 1
+
+            index = 0
+            while True:
+                if not skip_ws():
+                    report.fatal = "Неожиданный конец файла"
+                    return
+                if buf[pos] == ']' and index == 0:
+                    return
+
+                # Элемент может оказаться разрезан границей блока - дочитываем
+                while True:
+                    try:
+                        item, end = decoder.raw_decode(buf, pos)
+                        break
+                    except json.JSONDecodeError as e:
+                        if len(buf) - pos > DataLoader.MAX_ITEM_SIZE or not fill():
+                            report.fatal = f"Ошибка парсинга JSON в элементе {index}: {e.msg}"
+                            return
+                pos = end
+
+                report.items += 1
+                dish, error = DataLoader._validate_item(index, item)
+                if error:
+                    report.add_error(error)
+                else:
+                    report.loaded += 1
+                    yield dish
+                index += 1
+
+                if not skip_ws():
+                    report.fatal = "Неожиданный конец файла"
+                    return
+                if buf[pos] == ']':
+                    return
+                if buf[pos] != ',':
+                    report.fatal = f"Ожидалась ',' после элемента {index - 1}"
+                    return
+                pos += 1
+        finally:
+            report.elapsed = time.perf_counter() - started
+
+    @staticmethod
+    def load_dishes_from_file(path: str) -> Tuple[List[Dish], LoadReport]:
+        """
+        Загружает каталог из файла потоково (см. iter_dishes).
+
+        В отличие от load_dishes_from_json, некорректные элементы
+        пропускаются, а их список возвращается в отчёте.
+        """
+        report = LoadReport()
+        dishes = list(DataLoader.iter_dishes(path, report))
+        return dishes, report
+
+    @staticmethod
+    def load_catalog_from_file(path: str, use_snapshot: bool = True) -> Tuple[DishCatalog, LoadReport]:
+        """
+        То же, что load_dishes_from_file, но блюда сразу складываются
+        в колоночный DishCatalog: в памяти не остаётся объектов Dish.
+
+        При use_snapshot рядом с файлом ведётся двоичный снимок (см. data/snapshot.py):
+        если он актуален, каталог отображается из него без разбора JSON и
+        копирования (report.snapshot = True), иначе файл разбирается и снимок
+        перезаписывается. Сообщения об ошибках в снимке не хранятся, только их число.
+        """
+        report = LoadReport()
+        if use_snapshot:
+            started = time.perf_counter()
+            cached = read_snapshot(path)
+            if cached is not None:
+                catalog, report.items, report.error_count = cached
+                report.loaded = len(catalog)
+                report.bytes_read = os.path.getsize(path)
+                report.elapsed = time.perf_counter() - started
+                report.snapshot = True
+                return catalog, report
+
+        catalog = DishCatalog.from_dishes(DataLoader.iter_dishes(path, report))
+        if use_snapshot and report.fatal is None:
+            try:
+                write_snapshot(catalog, path, report.items, report.error_count)
+            except OSError:
+                pass  # Снимок - только ускорение, без него каталог всё равно загружен
+        return catalog, report
+
+    @staticmethod
+    def parse_fields(cls, data: Dict[str, Any], where: str):
+        """
+        Dataclass параметров (DietTarget, DietTolerance, MealStructure) из словаря.
+        Пропущенные поля - по умолчанию, неизвестные - ValueError.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"{where}: ожидается объект")
+        fields = cls.__dataclass_fields__
+        unknown = set(data) - set(fields)
+        if unknown:
+            raise ValueError(f"{where}: неизвестные поля {', '.join(sorted(unknown))}")
+        try:
+            return cls(**{key: fields[key].type(value) for key, value in data.items()})
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{where}: {e}") from e
+
+    @staticmethod
+    def parse_target(data: Dict[str, Any], where: str = "Запрос") -> Tuple[DietTarget, DietTolerance]:
+        """
+        Цель и допуски из полей "target" и "tolerance" запроса.
+        Как в интерфейсе, проценты БЖУ имеют приоритет над граммами.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"{where}: ожидается объект")
+        target = DataLoader.parse_fields(DietTarget, data.get('target', {}), f"{where}, target")
+        if target.proteins_pct > 0 or target.fats_pct > 0 or target.carbs_pct > 0:
+            target = target.resolve_macros()
+        tolerance = DataLoader.parse_fields(DietTolerance, data.get('tolerance', {}),
+                                            f"{where}, tolerance")
+        return target, tolerance
+
+    @staticmethod
+    def parse_structure(data: Dict[str, Any], where: str = "Запрос") -> MealStructure:
+        """Структура питания из словаря с проверкой, как в интерфейсе"""
+        structure = DataLoader.parse_fields(MealStructure, data, where)
+        if structure.num_meals < 1:
+            raise ValueError(f"{where}: количество приемов пищи должно быть >= 1")
+        if structure.min_dishes_per_meal > structure.max_dishes_per_meal:
+            raise ValueError(f"{where}: мин блюд не может быть больше макс")
+        return structure
+
     @staticmethod
     def get_sample_json() -> str:
         """Возвращает пример JSON для заполнения"""
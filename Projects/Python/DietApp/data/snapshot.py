@@ -0,0 +1,133 @@
+"""Двоичный снимок разобранного каталога блюд для быстрой повторной загрузки"""
+import hashlib
+import mmap
+import os
+import struct
+from typing import Optional, Tuple
+from models.catalog import DishCatalog, StringTable, NUMERIC_FIELDS
+
+
+# Расширение файла снимка рядом с исходным JSON
+SNAPSHOT_SUFFIX = '.dcat'
+
+_MAGIC = b'DIETCAT1'
+# magic, число блюд, mtime_ns и размер источника, sha256 источника,
+# длины буферов названий и рецептов, число разобранных/отброшенных элементов
+_HEADER = struct.Struct('<8sqqq32sqqqq')
+_ALIGN = 8
+
+
+def snapshot_path(source_path: str) -> str:
+    """Путь к снимку для исходного файла"""
+    return source_path + SNAPSHOT_SUFFIX
+
+
+def file_hash(path: str) -> bytes:
+    """SHA-256 содержимого файла"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def _pad(length: int) -> int:
+    return -length % _ALIGN
+
+
+def _touch(path: str, stat: os.stat_result) -> None:
+    """Запоминает новый mtime источника, чтобы в следующий раз не считать хэш"""
+    try:
+        with open(path, 'r+b') as f:
+            f.seek(struct.calcsize('<8sq'))
+            f.write(struct.pack('<qq', stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        pass
+
+
+def write_snapshot(catalog: DishCatalog, source_path: str, items: int = 0,
+                   error_count: int = 0, path: Optional[str] = None) -> str:
+    """
+    Сохраняет каталог в двоичный снимок рядом с source_path.
+
+    Раскладка: заголовок, столбцы NUMERIC_FIELDS (float64), смещения названий
+    и рецептов (int64), затем буферы UTF-8. Все секции выровнены на 8 байт,
+    поэтому при чтении столбцы отображаются из mmap без копирования.
+    Файл пишется во временный и подменяется атомарно.
+
+    Returns: путь к снимку
+    """
+    path = path or snapshot_path(source_path)
+    stat = os.stat(source_path)
+    names, recipes = catalog._names, catalog._recipes
+    header = _HEADER.pack(
+        _MAGIC, len(catalog), stat.st_mtime_ns, stat.st_size, file_hash(source_path),
+        len(names._data), len(recipes._data), items or len(catalog), error_count
+    )
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(b'\0' * _pad(len(header)))
+        for key in NUMERIC_FIELDS:
+            f.write(memoryview(catalog.column(key)).cast('B'))
+        f.write(memoryview(names._offsets).cast('B'))
+        f.write(memoryview(recipes._offsets).cast('B'))
+        f.write(names._data)
+        f.write(b'\0' * _pad(len(names._data)))
+        f.write(recipes._data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_snapshot(source_path: str,
+                  path: Optional[str] = None) -> Optional[Tuple[DishCatalog, int, int]]:
+    """
+    Открывает снимок, если он соответствует текущему source_path.
+
+    Снимок считается актуальным, если совпадают mtime и размер источника;
+    иначе сравнивается SHA-256 (файл могли перезаписать тем же содержимым).
+    Данные не копируются: столбцы и строки - memoryview поверх mmap,
+    отображение живёт, пока жив каталог.
+
+    Returns: (каталог, число разобранных элементов, число отброшенных) или None
+    """
+    path = path or snapshot_path(source_path)
+    try:
+        stat = os.stat(source_path)
+        with open(path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(buf) < _HEADER.size:
+        return None
+    (magic, count, mtime_ns, size, digest,
+     names_len, recipes_len, items, error_count) = _HEADER.unpack_from(buf)
+    if magic != _MAGIC:
+        return None
+    if (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+        if digest != file_hash(source_path):
+            return None
+        _touch(path, stat)
+
+    pos = _HEADER.size + _pad(_HEADER.size)
+    expected = (pos + count * 8 * len(NUMERIC_FIELDS) + 2 * (count + 1) * 8
+                + names_len + _pad(names_len) + recipes_len)
+    if len(buf) < expected:
+        return None
+    view = memoryview(buf)
+
+    def take(length: int) -> memoryview:
+        nonlocal pos
+        part = view[pos:pos + length]
+        pos += length
+        return part
+
+    columns = {key: take(count * 8).cast('d') for key in NUMERIC_FIELDS}
+    name_offsets = take((count + 1) * 8).cast('q')
+    recipe_offsets = take((count + 1) * 8).cast('q')
+    names = StringTable(take(names_len), name_offsets)
+    take(_pad(names_len))
+    recipes = StringTable(take(recipes_len), recipe_offsets)
+    return DishCatalog(columns, names, recipes), items, error_count
@@ -1,9 +1,14 @@
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 from typing import Dict
 from data.loader import DataLoader
 from solver.factory import SolverFactory
+from solver.cache import SolverCache
 from solver.pulp_solver import PULP_AVAILABLE
+from solver.preprocess import PreprocessReport
 from models.dish import DietTarget, DietTolerance, MealStructure
 import json
 
@@ -18,7 +23,18 @@ class DietApp:
         
         self.data_loader = DataLoader()
         self.solver = None
+        self.solver_prefers_pulp = None
+        self.result_cache = SolverCache()
+        # Фоновый расчёт: поток-решатель пишет прогресс и результат в очередь,
+        # главный поток забирает их в _poll_solver
+        self.solver_thread = None
+        self.solver_queue = queue.Queue()
+        self.cancel_event = threading.Event()
         self.dishes = []
+        # Каталог, открытый из файла: грузится через двоичный снимок и
+        # перечитывается только при изменении файла (mtime, размер)
+        self.catalog_path = None
+        self.catalog_stamp = None
         self.prefer_pulp = tk.BooleanVar(value=True)
 
         self._create_widgets()
@@ -136,14 +152,29 @@ class DietApp:
         self.ent_max_dishes.insert(0, "2")
 
         # Кнопка расчета
-        btn_calc = ttk.Button(left_frame, text="🔢 Рассчитать диету", 
-                              command=self.run_calculation)
-        btn_calc.grid(row=row+1, column=0, columnspan=4, pady=20, sticky=(tk.W, tk.E))
+        self.btn_calc = ttk.Button(left_frame, text="🔢 Рассчитать диету", 
+                                   command=self.run_calculation)
+        self.btn_calc.grid(row=row+1, column=0, columnspan=4, pady=(20, 5), sticky=(tk.W, tk.E))
+
+        # Прогресс расчёта и отмена
+        progress_frame = ttk.Frame(left_frame)
+        progress_frame.grid(row=row+2, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+        progress_frame.columnconfigure(0, weight=1)
+
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="determinate", maximum=100)
+        self.progress_bar.grid(row=0, column=0, sticky=(tk.W, tk.E))
+
+        self.btn_cancel = ttk.Button(progress_frame, text="⏹ Отмена",
+                                     command=self.cancel_calculation, state=tk.DISABLED)
+        self.btn_cancel.grid(row=0, column=1, padx=(5, 0))
+
+        self.lbl_progress = ttk.Label(progress_frame, text="", foreground="gray")
+        self.lbl_progress.grid(row=1, column=0, columnspan=2, sticky=tk.W)
         
         # Кнопка очистки
         btn_clear = ttk.Button(left_frame, text="🗑 Очистить результат", 
                                command=self.clear_output)
-        btn_clear.grid(row=row+2, column=0, columnspan=4, pady=5, sticky=(tk.W, tk.E))
+        btn_clear.grid(row=row+3, column=0, columnspan=4, pady=5, sticky=(tk.W, tk.E))
 
     def _create_data_frame(self, parent):
         """Создает панель данных и результатов"""
@@ -165,6 +196,8 @@ class DietApp:
                    command=self._load_sample_data).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="✓ Проверить JSON", 
                    command=self._validate_json).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="📂 Открыть файл",
+                   command=self._open_catalog_file).pack(side=tk.LEFT, padx=5)
 
         ttk.Label(right_frame, text="📊 Результат (JSON):").grid(row=3, column=0, sticky=tk.W, pady=(10,0))
         self.txt_output = scrolledtext.ScrolledText(right_frame, height=10, width=60)
@@ -185,7 +218,8 @@ class DietApp:
                 status = "⚠️ PuLP доступен (используется эвристика)"
                 self.lbl_solver_status.config(foreground="orange")
         else:
-            status = "❌ PuLP не установлен (используется эвристика)"
+            status = (f"❌ PuLP не установлен (до {SolverFactory.BNB_MAX_DISHES} блюд - "
+                      f"точный перебор, иначе эвристика)")
             self.lbl_solver_status.config(foreground="red")
 
         self.lbl_solver_status.config(text=status)
@@ -250,11 +284,62 @@ class DietApp:
 
     def _load_sample_data(self):
         """Загружает пример данных в поле ввода"""
+        self.catalog_path = None
+        self.txt_input.config(state=tk.NORMAL)
         self.txt_input.delete("1.0", tk.END)
         self.txt_input.insert(tk.END, self.data_loader.get_sample_json())
 
+    def _open_catalog_file(self):
+        """Открывает JSON-файл каталога (большие каталоги не выводятся в поле ввода)"""
+        path = filedialog.askopenfilename(
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        self.catalog_path = path
+        self.catalog_stamp = None
+        if self._load_dishes() is None:
+            self._load_sample_data()
+            return
+        self.txt_input.delete("1.0", tk.END)
+        self.txt_input.insert(tk.END, f"Каталог из файла: {path}\n"
+                                      f"Нажмите «Загрузить пример», чтобы вернуться к вводу JSON")
+        self.txt_input.config(state=tk.DISABLED)
+
+    def _load_dishes(self):
+        """Блюда из открытого файла или из поля ввода; None при ошибке"""
+        if self.catalog_path is None:
+            json_data = self.txt_input.get("1.0", tk.END)
+            dishes, error = self.data_loader.load_dishes_from_json(json_data)
+            if error:
+                messagebox.showerror("Ошибка данных", error)
+                return None
+            return dishes
+
+        try:
+            stat = os.stat(self.catalog_path)
+        except OSError as e:
+            messagebox.showerror("Ошибка данных", f"Не удалось открыть файл: {e}")
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.catalog_stamp:
+            return self.dishes
+
+        catalog, report = self.data_loader.load_catalog_from_file(self.catalog_path)
+        if report.fatal and not len(catalog):
+            messagebox.showerror("Ошибка данных", report.summary())
+            return None
+        self.lbl_progress.config(text=report.summary())
+        self.catalog_stamp = stamp
+        return catalog
+
     def _validate_json(self):
         """Проверяет корректность JSON"""
+        if self.catalog_path is not None:
+            self.catalog_stamp = None
+            if self._load_dishes() is not None:
+                messagebox.showinfo("OK", self.lbl_progress.cget("text"))
+            return
         json_data = self.txt_input.get("1.0", tk.END)
         dishes, error = self.data_loader.load_dishes_from_json(json_data)
         
@@ -339,7 +424,10 @@ class DietApp:
             return None
 
     def run_calculation(self):
-        """Запускает расчет диеты"""
+        """Запускает расчет диеты в фоновом потоке"""
+        if self.solver_thread is not None and self.solver_thread.is_alive():
+            return
+
         # Сбор параметров
         params = self._collect_parameters()
         if not params:
@@ -348,41 +436,129 @@ class DietApp:
         target, tolerance, structure = params
 
         # Загрузка блюд
-        json_data = self.txt_input.get("1.0", tk.END)
-        dishes, error = self.data_loader.load_dishes_from_json(json_data)
-        
-        if error:
-            messagebox.showerror("Ошибка данных", error)
+        dishes = self._load_dishes()
+        if dishes is None:
             return
         
+        # Создание решателя через фабрику. Если блюда и метод не менялись,
+        # решатель переиспользуется вместе с уже построенной моделью
+        prefer_pulp = self.prefer_pulp.get()
+        if (self.solver is None or (dishes is not self.dishes and dishes != self.dishes)
+                or prefer_pulp != self.solver_prefers_pulp):
+            self.solver = SolverFactory.create(dishes, prefer_pulp)
+            self.solver_prefers_pulp = prefer_pulp
         self.dishes = dishes
 
-        # Создание решателя через фабрику
-        self.solver = SolverFactory.create(self.dishes, self.prefer_pulp.get())
-        method_name = SolverFactory.get_method_name()
+        # Решатель сообщает прогресс и проверяет отмену из потока расчёта
+        self.cancel_event.clear()
+        self.solver.stop_event = self.cancel_event
+        self.solver.progress_callback = lambda info: self.solver_queue.put(("progress", info))
+
+        self.btn_calc.config(state=tk.DISABLED)
+        self.btn_cancel.config(state=tk.NORMAL)
+        self.progress_bar.config(value=0)
+        self.lbl_progress.config(text="Расчёт...")
+        self.root.config(cursor="watch")
+
+        self.solver_thread = threading.Thread(
+            target=self._solve_in_background,
+            args=(self.dishes, target, tolerance, structure, prefer_pulp, self.solver),
+            daemon=True
+        )
+        self.solver_thread.start()
+        self.root.after(100, self._poll_solver)
 
-        # Запуск расчета
+    def cancel_calculation(self):
+        """Просит решатель остановиться; будет показан лучший найденный результат"""
+        self.cancel_event.set()
+        self.btn_cancel.config(state=tk.DISABLED)
+        self.lbl_progress.config(text="Отмена...")
+
+    def _solve_in_background(self, dishes, target, tolerance, structure, prefer_pulp, solver):
+        """Тело фонового потока: виджеты отсюда не трогаем, только очередь"""
         try:
-            self.root.config(cursor="watch")
-            self.root.update()
-            
-            result = self.solver.solve(target, tolerance, structure)
-            
-            # Вывод результата
-            self.txt_output.delete("1.0", tk.END)
-            self.txt_output.insert(tk.END, json.dumps(result, ensure_ascii=False, indent=2))
-            
-            if result.get('status') == 'success':
-                method_used = result.get('method', 'Unknown')
-                messagebox.showinfo("Готово", 
-                    f"Диета рассчитана!\n"
-                    f"Метод: {method_used}\n"
-                    f"Общая цена: {result.get('total_price', 0)} руб.\n"
-                    f"Общий вес: {result.get('total_weight', 0)} г")
-            else:
-                messagebox.showwarning("Внимание", result.get('message', 'Ошибка расчета'))
-                
+            result = self.result_cache.solve(
+                dishes, target, tolerance, structure,
+                prefer_pulp=prefer_pulp, solver=solver
+            )
+            self.solver_queue.put(("result", result))
         except Exception as e:
-            messagebox.showerror("Ошибка", f"Произошла ошибка: {str(e)}")
-        finally:
-            self.root.config(cursor="")
\ No newline at end of file
+            self.solver_queue.put(("error", e))
+
+    def _poll_solver(self):
+        """Забирает сообщения из потока расчёта (вызывается через root.after)"""
+        progress = None
+        try:
+            while True:
+                kind, payload = self.solver_queue.get_nowait()
+                if kind == "progress":
+                    progress = payload
+                else:
+                    self._finish_calculation(kind, payload)
+                    return
+        except queue.Empty:
+            pass
+
+        if progress is not None:
+            self._show_progress(progress)
+        self.root.after(100, self._poll_solver)
+
+    def _show_progress(self, info: Dict):
+        """Обновляет полосу прогресса и строку состояния"""
+        phases = {"search": "Поиск", "chains": "Цепочки", "refine": "Доводка",
+                  "cbc": "CBC", "bnb": "Перебор"}
+        phase = phases.get(info["phase"], info["phase"])
+        best = info["best_score"]
+        best_text = "—" if best == float('inf') else f"{best:.2f}"
+
+        if info["total"]:
+            self.progress_bar.config(mode="determinate",
+                                     value=100 * info["iteration"] / info["total"])
+            text = f"{phase}: {info['iteration']} / {info['total']}, лучший штраф {best_text}"
+        else:
+            # Доводка ограничена временем, а не числом шагов
+            self.progress_bar.config(mode="indeterminate")
+            self.progress_bar.step(5)
+            text = f"{phase}: шаг {info['iteration']}, лучший штраф {best_text}"
+
+        if not self.cancel_event.is_set():
+            self.lbl_progress.config(text=text)
+
+    def _finish_calculation(self, kind: str, payload):
+        """Показывает результат фонового расчёта и возвращает интерфейс в исходное состояние"""
+        self.solver_thread = None
+        self.root.config(cursor="")
+        self.btn_calc.config(state=tk.NORMAL)
+        self.btn_cancel.config(state=tk.DISABLED)
+        self.progress_bar.config(mode="determinate", value=100)
+        # Сообщения от уже завершённого расчёта больше не нужны
+        while not self.solver_queue.empty():
+            self.solver_queue.get_nowait()
+
+        if kind == "error":
+            self.lbl_progress.config(text="")
+            messagebox.showerror("Ошибка", f"Произошла ошибка: {str(payload)}")
+            return
+
+        result = payload
+        cancelled = result.get('cancelled', False)
+        status = "Расчёт отменён" if cancelled else "Готово"
+        if result.get('preprocess'):
+            status += ". " + PreprocessReport(**result['preprocess']).summary()
+        self.lbl_progress.config(text=status)
+
+        # Вывод результата
+        self.txt_output.delete("1.0", tk.END)
+        self.txt_output.insert(tk.END, json.dumps(result, ensure_ascii=False, indent=2))
+        
+        if result.get('status') == 'success':
+            method_used = result.get('method', 'Unknown')
+            title = "Отменено" if cancelled else "Готово"
+            header = "Показан лучший найденный вариант" if cancelled else "Диета рассчитана!"
+            messagebox.showinfo(title, 
+                f"{header}\n"
+                f"Метод: {method_used}\n"
+                f"Общая цена: {result.get('total_price', 0)} руб.\n"
+                f"Общий вес: {result.get('total_weight', 0)} г")
+        else:
+            messagebox.showwarning("Внимание", result.get('message', 'Ошибка расчета'))
@@ -1,3 +1,5 @@
 from .dish import Dish, Meal, DietTarget, DietTolerance, MealStructure
+from .catalog import DishCatalog, DishRow, StringTable
 
-__all__ = ['Dish', 'Meal', 'DietTarget', 'DietTolerance', 'MealStructure']
\ No newline at end of file
+__all__ = ['Dish', 'Meal', 'DietTarget', 'DietTolerance', 'MealStructure',
+           'DishCatalog', 'DishRow', 'StringTable']
@@ -0,0 +1,197 @@
+"""Колоночное хранение каталога блюд"""
+from array import array
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Union
+from .dish import Dish
+
+
+# Числовые поля блюда в порядке хранения
+NUMERIC_FIELDS = ('calories', 'proteins', 'fats', 'carbs', 'price', 'weight')
+
+
+class StringTable:
+    """
+    Таблица строк: все строки подряд в одном буфере UTF-8 плюс массив смещений.
+
+    Строка декодируется только при обращении к ней. Буфер и смещения могут
+    быть любыми объектами с буферным протоколом (bytearray, mmap, memoryview),
+    дописывать строки можно только в bytearray/array.
+    """
+
+    __slots__ = ('_data', '_offsets')
+
+    def __init__(self, data=None, offsets=None):
+        self._data = bytearray() if data is None else data
+        self._offsets = array('q', [0]) if offsets is None else offsets
+
+    def append(self, value: str) -> None:
+        self._data += value.encode('utf-8')
+        self._offsets.append(len(self._data))
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self._data[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) + len(self._offsets) * self._offsets.itemsize
+
+
+def _column_property(key: str) -> property:
+    def getter(self) -> float:
+        return self._catalog._columns[key][self._index]
+    return property(getter, doc=f"Значение '{key}' из столбца каталога")
+
+
+class DishRow:
+    """
+    Представление строки DishCatalog с интерфейсом Dish (только чтение).
+
+    Хранит лишь ссылку на каталог и номер строки; значения читаются
+    из столбцов при обращении.
+    """
+
+    __slots__ = ('_catalog', '_index')
+
+    def __init__(self, catalog: 'DishCatalog', index: int):
+        self._catalog = catalog
+        self._index = index
+
+    calories = _column_property('calories')
+    proteins = _column_property('proteins')
+    fats = _column_property('fats')
+    carbs = _column_property('carbs')
+    price = _column_property('price')
+    weight = _column_property('weight')
+
+    @property
+    def index(self) -> int:
+        """Номер строки в каталоге"""
+        return self._index
+
+    @property
+    def name(self) -> str:
+        return self._catalog._names[self._index]
+
+    @property
+    def recipe(self) -> str:
+        return self._catalog._recipes[self._index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразование в словарь (как Dish.to_dict)"""
+        data = {'name': self.name}
+        for key in NUMERIC_FIELDS:
+            data[key] = self._catalog._columns[key][self._index]
+        data['recipe'] = self.recipe
+        return data
+
+    def to_dish(self) -> Dish:
+        """Полноценный объект Dish с теми же значениями"""
+        return Dish(**self.to_dict())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Dish, DishRow)):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"DishRow({self._index}, name={self.name!r})"
+
+
+class DishCatalog:
+    """
+    Каталог блюд в колоночном виде.
+
+    Числовые поля хранятся в непрерывных массивах array('d') (по 8 байт на
+    значение), названия и рецепты - в StringTable. Объекты Dish не создаются:
+    индексация и перебор возвращают лёгкие DishRow, а решатели могут брать
+    столбцы напрямую через column() / to_matrix().
+    """
+
+    def __init__(self, columns: Optional[Dict[str, Sequence[float]]] = None,
+                 names: Optional[StringTable] = None, recipes: Optional[StringTable] = None):
+        """
+        Args:
+            columns: Готовые столбцы NUMERIC_FIELDS (array('d'), memoryview и т.п.)
+            names, recipes: Готовые таблицы строк
+        По умолчанию создаётся пустой каталог для заполнения через append().
+        """
+        self._columns = columns if columns is not None else {key: array('d') for key in NUMERIC_FIELDS}
+        self._names = names if names is not None else StringTable()
+        self._recipes = recipes if recipes is not None else StringTable()
+
+    @classmethod
+    def from_dishes(cls, dishes: Iterable[Union[Dish, Dict[str, Any]]]) -> 'DishCatalog':
+        """Строит каталог из блюд или словарей (итератор читается один раз)"""
+        catalog = cls()
+        for dish in dishes:
+            catalog.append(dish)
+        return catalog
+
+    def append(self, dish: Union[Dish, DishRow, Dict[str, Any]]) -> None:
+        """Добавляет блюдо в конец каталога"""
+        if isinstance(dish, dict):
+            dish = Dish.from_dict(dish)
+        for key in NUMERIC_FIELDS:
+            self._columns[key].append(float(getattr(dish, key)))
+        self._names.append(dish.name)
+        self._recipes.append(dish.recipe)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, index: int) -> DishRow:
+        if isinstance(index, slice):
+            return [DishRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс блюда вне каталога")
+        return DishRow(self, index)
+
+    def __iter__(self) -> Iterator[DishRow]:
+        for i in range(len(self)):
+            yield DishRow(self, i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (DishCatalog, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def column(self, key: str) -> Sequence[float]:
+        """Столбец числового поля без копирования"""
+        return self._columns[key]
+
+    def to_matrix(self, keys: Sequence[str] = NUMERIC_FIELDS) -> 'np.ndarray':
+        """Матрица (len x len(keys)) float64 из столбцов (требуется NumPy)"""
+        import numpy as np
+        if not len(self):
+            return np.empty((0, len(keys)))
+        return np.column_stack([np.frombuffer(self._columns[key], dtype=np.float64) for key in keys])
+
+    def to_dishes(self) -> List[Dish]:
+        """Список полноценных Dish (например, для старого кода)"""
+        return [row.to_dish() for row in self]
+
+    @property
+    def nbytes(self) -> int:
+        """Объём данных каталога в байтах (без служебных объектов Python)"""
+        numeric = sum(len(col) * 8 for col in self._columns.values())
+        return numeric + self._names.nbytes + self._recipes.nbytes
+
+
+def dish_columns(dishes: Sequence, keys: Sequence[str]) -> Dict[str, Sequence[float]]:
+    """
+    Столбцы показателей для списка Dish или DishCatalog.
+
+    Для каталога возвращаются его массивы без копирования, для списка
+    блюд значения собираются за один проход по каждому полю.
+    """
+    if isinstance(dishes, DishCatalog):
+        return {key: dishes.column(key) for key in keys}
+    return {key: [getattr(d, key) for d in dishes] for key in keys}
@@ -0,0 +1 @@
+"""HTTP-сервис расчёта диет (запуск: python -m service.server)"""
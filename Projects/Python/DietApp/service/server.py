@@ -0,0 +1,404 @@
+"""
+HTTP-сервис расчёта диет на asyncio (без сторонних зависимостей).
+
+    python -m service.server --port 8080 --workers 4 --catalog menu=dishes.json
+
+Эндпоинты (JSON):
+    POST /solve      {"catalog", "target", "tolerance", "structure", "method", "time_limit"}
+    POST /catalogs   {"name", "path"} или {"name", "dishes": [...]} - загрузить каталог
+    GET  /catalogs   загруженные каталоги
+    GET  /metrics    задержки и состояние очереди
+    GET  /health
+
+Расчёты идут в пуле процессов. Каждый процесс держит в памяти каталоги
+(открытые через снимок, см. data/snapshot.py) и решатели с построенными
+моделями, поэтому повторные запросы к тому же каталогу не строят их заново.
+Если очередь заполнена, запрос сразу получает 503 с Retry-After.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from data.loader import DataLoader
+from models.dish import DietTarget, DietTolerance, MealStructure
+from solver.factory import SolverFactory
+
+
+# Сколько решателей держит один процесс пула (вытесняются давно не использованные)
+WORKER_SOLVERS = 16
+# Сколько последних запросов учитывается в перцентилях задержки
+LATENCY_WINDOW = 1000
+# Ограничение размера тела запроса (байт)
+MAX_BODY = 64 << 20
+
+_NAME_RE = re.compile(r'^[\w-]{1,64}$')
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+# Решатели процесса-воркера: (путь, метка файла, метод, time_limit) -> решатель
+_worker_solvers: 'OrderedDict[tuple, object]' = OrderedDict()
+
+
+def _worker_solve(path: str, stamp: Tuple[int, int], method: Optional[str],
+                  time_limit: Optional[float], target: DietTarget, tolerance: DietTolerance,
+                  structure: MealStructure) -> Tuple[Dict[str, Any], float]:
+    """Расчёт в процессе пула на закэшированном решателе; возвращает (результат, секунды)"""
+    started = time.perf_counter()
+    key = (path, stamp, method, time_limit)
+    solver = _worker_solvers.get(key)
+    if solver is None:
+        catalog, _ = DataLoader.load_catalog_from_file(path)
+        solver = SolverFactory.create(catalog, method=method, time_limit=time_limit)
+        _worker_solvers[key] = solver
+        while len(_worker_solvers) > WORKER_SOLVERS:
+            _worker_solvers.popitem(last=False)
+    else:
+        _worker_solvers.move_to_end(key)
+    result = solver.solve(target, tolerance, structure)
+    return result, time.perf_counter() - started
+
+
+class ServiceError(Exception):
+    """Ошибка запроса с HTTP-статусом"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyStats:
+    """Счётчик и перцентили задержек по последним LATENCY_WINDOW запросам"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self._recent: deque = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self._recent.append(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+
+        def percentile(q: float) -> Optional[float]:
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))], 6)
+
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 6) if self.count else None,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(recent[-1], 6) if recent else None,
+        }
+
+
+class SolveService:
+    """
+    Сервис расчёта: каталоги, пул процессов, ограниченная очередь и метрики.
+
+    Одновременно принимается не больше workers + max_queue расчётов;
+    остальные запросы отклоняются сразу (503), а не копятся в памяти.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 data_dir: Optional[str] = None, time_limit: Optional[float] = None):
+        """
+        Args:
+            workers: Число процессов пула (None - по числу ядер)
+            max_queue: Сколько расчётов может ждать свободного процесса
+                       (по умолчанию 4 на процесс)
+            data_dir: Каталог для файлов каталогов, присланных в запросе
+            time_limit: Ограничение времени расчёта по умолчанию, сек
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = 4 * self.workers if max_queue is None else max_queue
+        self.data_dir = data_dir or tempfile.mkdtemp(prefix="dietapp_")
+        self.time_limit = time_limit
+        # Имя -> {"path", "stamp", "catalog", "report"}
+        self.catalogs: Dict[str, Dict[str, Any]] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._pending = 0
+        self._started = time.time()
+        self.counters = {"requests": 0, "solved": 0, "failed": 0, "rejected": 0, "errors": 0}
+        self.latency = {name: LatencyStats() for name in ("total", "queue", "solve")}
+
+    # --- Запуск и остановка ---
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    # --- Каталоги ---
+
+    async def load_catalog(self, name: str, path: Optional[str] = None,
+                           dishes: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Загружает каталог из файла или из списка блюд (он сохраняется в data_dir).
+        Разбор и запись снимка идут в потоке, не блокируя цикл событий.
+        """
+        if not isinstance(name, str) or not _NAME_RE.match(name):
+            raise ServiceError(400, "Имя каталога: латиница, цифры, '_' и '-'")
+        if dishes is not None:
+            path = os.path.join(self.data_dir, f"{name}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(dishes, f, ensure_ascii=False)
+        elif not isinstance(path, str):
+            raise ServiceError(400, "Нужно поле 'path' или 'dishes'")
+
+        path = os.path.abspath(path)
+        loop = asyncio.get_running_loop()
+        try:
+            stamp = self._stamp(path)
+            catalog, report = await loop.run_in_executor(None, DataLoader.load_catalog_from_file, path)
+        except OSError as e:
+            raise ServiceError(400, f"Не удалось открыть каталог: {e}") from e
+        if report.fatal is not None or not len(catalog):
+            raise ServiceError(400, report.fatal or "Каталог блюд пуст")
+
+        self.catalogs[name] = {"path": path, "stamp": stamp, "catalog": catalog, "report": report}
+        return self._catalog_info(name)
+
+    @staticmethod
+    def _stamp(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _catalog_info(self, name: str) -> Dict[str, Any]:
+        entry = self.catalogs[name]
+        return {"name": name, "path": entry["path"], "dishes": len(entry["catalog"]),
+                "summary": entry["report"].summary()}
+
+    async def _current_catalog(self, name: str) -> Dict[str, Any]:
+        """Каталог по имени; изменившийся на диске файл перезагружается"""
+        entry = self.catalogs.get(name)
+        if entry is None:
+            raise ServiceError(404, f"Каталог не найден: {name}")
+        try:
+            changed = self._stamp(entry["path"]) != entry["stamp"]
+        except OSError:
+            changed = False
+        if changed:
+            await self.load_catalog(name, entry["path"])
+            entry = self.catalogs[name]
+        return entry
+
+    # --- Расчёт ---
+
+    async def solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Решает запрос в пуле процессов; результат дополняется полем "latency" """
+        started = time.perf_counter()
+        if self._pending >= self.workers + self.max_queue:
+            self.counters["rejected"] += 1
+            raise ServiceError(503, "Очередь расчётов заполнена, повторите позже")
+
+        if not isinstance(request, dict):
+            raise ServiceError(400, "Запрос: ожидается объект")
+        try:
+            target, tolerance = DataLoader.parse_target(request)
+            structure = DataLoader.parse_structure(request.get("structure", {}), "Запрос, structure")
+            time_limit = request.get("time_limit", self.time_limit)
+            time_limit = None if time_limit is None else float(time_limit)
+        except (TypeError, ValueError) as e:
+            raise ServiceError(400, str(e)) from e
+        method = request.get("method")
+        if method is not None and method not in SolverFactory.METHOD_NAMES:
+            raise ServiceError(400, f"Неизвестный метод решения: {method}")
+        entry = await self._current_catalog(request.get("catalog"))
+
+        self._pending += 1
+        try:
+            result, solve_time = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _worker_solve, entry["path"], entry["stamp"], method,
+                time_limit, target, tolerance, structure
+            )
+        finally:
+            self._pending -= 1
+
+        total = time.perf_counter() - started
+        self.latency["total"].add(total)
+        self.latency["solve"].add(solve_time)
+        self.latency["queue"].add(max(0.0, total - solve_time))
+        self.counters["solved" if result.get("status") == "success" else "failed"] += 1
+        result["latency"] = {"total": round(total, 6), "solve": round(solve_time, 6)}
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "uptime": round(time.time() - self._started, 3),
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self._pending, self.workers),
+            "queued": max(0, self._pending - self.workers),
+            "counters": dict(self.counters),
+            "latency": {name: stats.to_dict() for name, stats in self.latency.items()},
+            "catalogs": len(self.catalogs),
+        }
+
+    # --- HTTP ---
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Dict[str, Any]:
+        route = path.split("?", 1)[0].rstrip("/") or "/"
+        if route == "/health" and method == "GET":
+            return {"status": "ok"}
+        if route == "/metrics" and method == "GET":
+            return self.metrics()
+        if route == "/catalogs" and method == "GET":
+            return {"catalogs": [self._catalog_info(name) for name in self.catalogs]}
+        if route not in ("/solve", "/catalogs"):
+            raise ServiceError(404, f"Неизвестный адрес: {route}")
+        if method != "POST":
+            raise ServiceError(405, "Ожидается POST")
+
+        try:
+            payload = json.loads(body.decode("utf-8") or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ServiceError(400, f"Ошибка JSON: {e}") from e
+        if route == "/solve":
+            return await self.solve(payload)
+        if not isinstance(payload, dict):
+            raise ServiceError(400, "Запрос: ожидается объект")
+        return await self.load_catalog(payload.get("name"), payload.get("path"), payload.get("dishes"))
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Читает один HTTP/1.1 запрос; None - клиент закрыл соединение"""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, path, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise ServiceError(400, "Неверная строка запроса")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise ServiceError(400, "Неверный Content-Length")
+        if length > MAX_BODY:
+            raise ServiceError(413, "Слишком большой запрос")
+        body = await reader.readexactly(length) if length else b""
+        return method, path, headers, body
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any],
+                        keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Обслуживает соединение (keep-alive), пока клиент его не закроет"""
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    self.counters["requests"] += 1
+                    status, payload = 200, await self._dispatch(method, path, body)
+                except ServiceError as e:
+                    status, payload = e.status, {"status": "error", "message": str(e)}
+                    # После ошибки разбора позиция в потоке неизвестна
+                    keep_alive = keep_alive and e.status not in (400, 413)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                except Exception as e:
+                    self.counters["errors"] += 1
+                    status, payload = 500, {"status": "error", "message": f"Ошибка сервиса: {e}"}
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int, catalogs: List[Tuple[str, str]], **options) -> None:
+    """Запускает сервис и работает до отмены (Ctrl+C)"""
+    service = SolveService(**options)
+    await service.start(host, port)
+    try:
+        for name, path in catalogs:
+            info = await service.load_catalog(name, path)
+            print(f"{name}: {info['summary']}")
+        print(f"Сервис запущен на http://{host}:{service.port} ({service.workers} процессов)")
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP-сервис расчёта диет")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, help="Число процессов (по умолчанию - по числу ядер)")
+    parser.add_argument("--max-queue", type=int, help="Сколько расчётов может ждать в очереди")
+    parser.add_argument("--time-limit", type=float, help="Ограничение времени расчёта по умолчанию, сек")
+    parser.add_argument("--data-dir", help="Каталог для присланных каталогов блюд")
+    parser.add_argument("--catalog", action="append", default=[], metavar="NAME=PATH",
+                        help="Загрузить каталог при старте (можно несколько раз)")
+    args = parser.parse_args(argv)
+
+    catalogs = []
+    for item in args.catalog:
+        name, sep, path = item.partition("=")
+        if not sep:
+            parser.error(f"--catalog ожидает NAME=PATH: {item}")
+        catalogs.append((name, path))
+
+    try:
+        asyncio.run(serve(args.host, args.port, catalogs, workers=args.workers,
+                          max_queue=args.max_queue, data_dir=args.data_dir,
+                          time_limit=args.time_limit))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,10 @@
 from .diet_solver import HeuristicDietSolver
 from .pulp_solver import PulpDietSolver, PULP_AVAILABLE
+from .bnb_solver import BranchAndBoundDietSolver
+from .vectorized import NUMPY_AVAILABLE
+from .batch import solve_batch
+from .preprocess import prune_dishes, PreprocessReport
+from .metrics import SolveMetrics, set_metrics_hook
 
-__all__ = ['HeuristicDietSolver', 'PulpDietSolver', 'PULP_AVAILABLE']
\ No newline at end of file
+__all__ = ['HeuristicDietSolver', 'PulpDietSolver', 'BranchAndBoundDietSolver', 'PULP_AVAILABLE', 'NUMPY_AVAILABLE', 'solve_batch',
+           'prune_dishes', 'PreprocessReport', 'SolveMetrics', 'set_metrics_hook']
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Пакетный расчёт диет для многих профилей на одном наборе блюд"""
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+from models.dish import Dish, DietTarget, DietTolerance, MealStructure
+from .factory import SolverFactory
+
+# Решатель процесса-воркера (создаётся один раз в _init_worker)
+_worker_solver = None
+
+
+def _create_solver(dishes: Union[List[Dish], str], prefer_pulp: bool,
+                   method: Optional[str], time_limit: Optional[float]):
+    """Решатель для списка блюд или файла каталога (открывается через его снимок)"""
+    if isinstance(dishes, str):
+        from data.loader import DataLoader
+        dishes, _ = DataLoader.load_catalog_from_file(dishes)
+    return SolverFactory.create(dishes, prefer_pulp, method, time_limit)
+
+
+def _init_worker(dishes: Union[List[Dish], str], prefer_pulp: bool,
+                 method: Optional[str] = None, time_limit: Optional[float] = None) -> None:
+    """Создаёт решатель воркера; модель и таблицы переиспользуются между профилями"""
+    global _worker_solver
+    _worker_solver = _create_solver(dishes, prefer_pulp, method, time_limit)
+
+
+def _solve_profile(solver, index: int, target: DietTarget, tolerance: DietTolerance,
+                   structure: MealStructure) -> Dict[str, Any]:
+    """Решает один профиль и замеряет время"""
+    started = time.perf_counter()
+    result = solver.solve(target, tolerance, structure)
+    return {
+        "index": index,
+        "result": result,
+        "elapsed": round(time.perf_counter() - started, 4)
+    }
+
+
+def _solve_in_worker(index: int, target: DietTarget, tolerance: DietTolerance,
+                     structure: MealStructure) -> Dict[str, Any]:
+    return _solve_profile(_worker_solver, index, target, tolerance, structure)
+
+
+def solve_batch(dishes: Union[List[Dish], str], profiles: List[Tuple[DietTarget, DietTolerance]],
+                structure: MealStructure, prefer_pulp: bool = True,
+                workers: Optional[int] = None, method: Optional[str] = None,
+                time_limit: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Решает задачу для списка профилей (цель, допуск) на общем наборе блюд.
+
+    Каждый процесс пула один раз создаёт решатель, поэтому всё, что решатель
+    готовит по набору блюд (модель PuLP, матрица показателей), общее для
+    всех профилей этого процесса. Результаты отдаются по мере готовности.
+
+    Вместо списка блюд можно передать путь к файлу каталога: тогда каждый
+    процесс открывает его сам через двоичный снимок (см. data/snapshot.py),
+    и блюда не сериализуются в воркеры.
+
+    Args:
+        dishes: Список блюд, DishCatalog или путь к JSON-файлу каталога
+        profiles: Пары (DietTarget, DietTolerance)
+        structure: Структура питания
+        prefer_pulp: Предпочитать PuLP если доступен
+        workers: Число процессов (None - по числу ядер, 1 - без пула)
+        method: Явный выбор метода (см. SolverFactory.create)
+        time_limit: Ограничение времени одного расчёта, сек
+
+    Yields:
+        {"index": номер профиля, "result": результат solve, "elapsed": секунды}
+    """
+    if workers == 1:
+        solver = _create_solver(dishes, prefer_pulp, method, time_limit)
+        for i, (target, tolerance) in enumerate(profiles):
+            yield _solve_profile(solver, i, target, tolerance, structure)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(dishes, prefer_pulp, method, time_limit)) as pool:
+        futures = [
+            pool.submit(_solve_in_worker, i, target, tolerance, structure)
+            for i, (target, tolerance) in enumerate(profiles)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,416 @@
+"""Точный решатель методом ветвей и границ (без PuLP)"""
+import time
+from typing import List, Dict, Any, Optional
+from models.dish import Dish, DietTarget, DietTolerance, MealStructure
+from models.catalog import dish_columns
+from .vectorized import NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+# Показатели, отклонение которых входит в целевую функцию (как в PulpDietSolver)
+OBJECTIVE_KEYS = ('calories', 'proteins', 'fats', 'carbs')
+# Столбцы строки блюда: показатели цели, затем цена
+_ROW_KEYS = OBJECTIVE_KEYS + ('price',)
+_PRICE = len(OBJECTIVE_KEYS)
+
+
+class _SearchStopped(Exception):
+    """Перебор прерван по времени или через stop_event"""
+
+
+class BranchAndBoundDietSolver:
+    """
+    Точный решатель без внешних зависимостей.
+
+    Решает ту же задачу, что PulpDietSolver без assign_meals: выбрать от
+    num_meals * min_dishes_per_meal до num_meals * max_dishes_per_meal блюд
+    с ценой не выше цены с допуском, минимизируя сумму модулей отклонений
+    БЖУ и калорий от цели плюс PRICE_WEIGHT * цена. Выбранные блюда
+    раскладываются по приёмам пищи по кругу, так что в каждом приёме их
+    число укладывается в MealStructure.
+
+    Перебор идёт по сочетаниям блюд в порядке убывания калорийности. Для
+    каждого суффикса списка заранее посчитаны суммы k самых малых и k самых
+    больших значений каждого показателя, поэтому нижняя граница целевой
+    функции для узла считается без перебора: по таблице для каждого
+    допустимого числа добавляемых блюд.
+
+    Без NumPy дерево обходится в глубину, потомки - в порядке возрастания
+    границы. С NumPy дерево обходится по уровням (число выбранных блюд):
+    весь уровень считается матрично кусками по LEVEL_CHUNK узлов, а
+    начальный рекорд даёт тот же обход с лучом шириной BEAM_WIDTH.
+    """
+
+    # Вес цены в целевой функции (совпадает с PulpDietSolver.PRICE_WEIGHT)
+    PRICE_WEIGHT = 0.01
+    # Как часто (в узлах) проверяются время, отмена и вызывается progress_callback
+    CHECK_EVERY = 4096
+    # Сколько узлов уровня считается за одну матричную операцию
+    LEVEL_CHUNK = 65536
+    # Ширина лучевого поиска, дающего начальный рекорд
+    BEAM_WIDTH = 256
+
+    def __init__(self, dishes: List[Dish], time_limit: Optional[float] = None,
+                 vectorized: Optional[bool] = None):
+        """
+        Args:
+            dishes: Список блюд
+            time_limit: Ограничение времени перебора в секундах; по истечении
+                        возвращается лучший найденный план с "optimal": False
+            vectorized: Считать границы через NumPy (по умолчанию - если установлен)
+        """
+        self.dishes = dishes
+        self.time_limit = time_limit
+        self.vectorized = NUMPY_AVAILABLE if vectorized is None else (vectorized and NUMPY_AVAILABLE)
+        self.progress_callback = None
+        self.stop_event = None
+        # Блюда в порядке перебора и таблицы границ (строятся один раз на набор блюд)
+        self._order: List[int] = []
+        self._rows: List[List[float]] = []
+        self._low: List[List[List[float]]] = []
+        self._high: List[List[List[float]]] = []
+
+    def _prepare_tables(self) -> None:
+        """
+        Готовит строки блюд и таблицы границ.
+
+        _low[i][c][k] - сумма k наименьших значений показателя c среди блюд
+        с номерами >= i (в порядке перебора), _high[i][c][k] - k наибольших.
+        """
+        if self._rows:
+            return
+        columns = dish_columns(self.dishes, _ROW_KEYS)
+        calories = columns['calories']
+        self._order = sorted(range(len(self.dishes)), key=lambda i: -calories[i])
+        self._rows = [[columns[key][i] for key in _ROW_KEYS] for i in self._order]
+
+        n = len(self._rows)
+        self._low = [None] * (n + 1)
+        self._high = [None] * (n + 1)
+        for i in range(n, -1, -1):
+            low, high = [], []
+            for c in range(len(_ROW_KEYS)):
+                values = sorted(row[c] for row in self._rows[i:])
+                low.append(self._prefix_sums(values))
+                high.append(self._prefix_sums(values[::-1]))
+            self._low[i] = low
+            self._high[i] = high
+
+        if self.vectorized:
+            # Те же таблицы массивами (n+1, показатель, k); недостижимые k -
+            # бесконечные границы, такие потомки отсекаются сами
+            self._rows_np = np.array(self._rows, dtype=np.float64).reshape(n, len(_ROW_KEYS))
+            self._low_np = np.full((n + 1, len(_ROW_KEYS), n + 1), np.inf)
+            self._high_np = np.full((n + 1, len(_ROW_KEYS), n + 1), -np.inf)
+            for i in range(n + 1):
+                self._low_np[i, :, :n - i + 1] = self._low[i]
+                self._high_np[i, :, :n - i + 1] = self._high[i]
+
+    @staticmethod
+    def _prefix_sums(values: List[float]) -> List[float]:
+        sums = [0.0]
+        for v in values:
+            sums.append(sums[-1] + v)
+        return sums
+
+    def _report(self, nodes: int, best_score: float):
+        """Передаёт прогресс перебора в progress_callback"""
+        if self.progress_callback is not None:
+            self.progress_callback({
+                "phase": "bnb",
+                "iteration": nodes,
+                "total": 0,
+                "best_score": best_score
+            })
+
+    def solve(self, target: DietTarget, tolerance: DietTolerance,
+              structure: MealStructure) -> Dict[str, Any]:
+        """
+        Находит план с доказуемо минимальной целевой функцией.
+
+        В результате дополнительно есть "objective" (значение целевой функции),
+        "optimal" (перебор завершён полностью) и "nodes" (число рассмотренных
+        узлов дерева).
+        """
+        if not self.dishes:
+            return {"status": "error", "message": "Список блюд пуст", "method": "BranchAndBound"}
+
+        self._prepare_tables()
+        tgt = target.to_dict()
+        tol = tolerance.to_dict()
+
+        self._target = [tgt[key] for key in OBJECTIVE_KEYS]
+        self._price_cap = tgt['price'] * (1 + tol['price'] / 100) + 1e-9
+        self._min_count = structure.min_dishes_per_meal * structure.num_meals
+        self._max_count = min(structure.max_dishes_per_meal * structure.num_meals, len(self._rows))
+        self._best_score = float('inf')
+        self._best: List[int] = []
+        self._nodes = 0
+        self._deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+
+        optimal = True
+        if self._bound(0, 0, [0.0] * len(_ROW_KEYS)) < float('inf'):
+            try:
+                if self.vectorized:
+                    self._evaluate(0, [0.0] * len(_ROW_KEYS), [])
+                    self._search_levels(beam=self.BEAM_WIDTH)
+                    self._search_levels()
+                else:
+                    self._search(0, 0, [0.0] * len(_ROW_KEYS), [])
+            except _SearchStopped:
+                optimal = False
+
+        cancelled = self.stop_event is not None and self.stop_event.is_set()
+        if self._best_score == float('inf'):
+            if cancelled:
+                return {"status": "error", "message": "Расчёт отменён",
+                        "method": "BranchAndBound", "cancelled": True}
+            message = "Нет допустимого решения" if optimal else "Не найдено решение за отведённое время"
+            return {"status": "error", "message": message, "method": "BranchAndBound"}
+
+        selected = [self.dishes[self._order[j]] for j in self._best]
+        result = self._format_result(selected, target, tolerance, structure)
+        result["objective"] = round(self._best_score, 4)
+        result["optimal"] = optimal
+        result["nodes"] = self._nodes
+        if cancelled:
+            result["cancelled"] = True
+        return result
+
+    def _bound(self, start: int, count: int, sums: List[float]) -> float:
+        """
+        Нижняя граница целевой функции для всех планов, которые получаются
+        из текущего добавлением блюд с номерами >= start.
+        """
+        n = len(self._rows)
+        need = max(self._min_count - count, 0)
+        room = min(self._max_count - count, n - start)
+        if need > room:
+            return float('inf')
+
+        low = self._low[start]
+        high = self._high[start]
+        price_low = low[_PRICE]
+        gaps = [tgt - sums[c] for c, tgt in enumerate(self._target)]
+
+        # Число добавляемых блюд общее для всех показателей, поэтому граница
+        # считается для каждого k отдельно и берётся минимальная
+        best = float('inf')
+        for k in range(need, room + 1):
+            price = sums[_PRICE] + price_low[k]
+            if price > self._price_cap:
+                break
+            bound = self.PRICE_WEIGHT * price
+            for c, gap in enumerate(gaps):
+                reach_low = low[c][k]
+                if gap < reach_low:
+                    bound += reach_low - gap
+                else:
+                    reach_high = high[c][k]
+                    if gap > reach_high:
+                        bound += gap - reach_high
+            if bound < best:
+                best = bound
+        return best
+
+    def _evaluate(self, count: int, sums: List[float], chosen: List[int]) -> None:
+        """Обновляет рекорд, если текущий набор блюд - допустимый план лучше него"""
+        if count < self._min_count or sums[_PRICE] > self._price_cap:
+            return
+        score = self.PRICE_WEIGHT * sums[_PRICE]
+        for c, tgt in enumerate(self._target):
+            score += abs(tgt - sums[c])
+        if score < self._best_score:
+            self._best_score = score
+            self._best = list(chosen)
+
+    def _search(self, start: int, count: int, sums: List[float], chosen: List[int]) -> None:
+        """Обход в глубину: потомки узла - добавление одного блюда с номером >= start"""
+        self._nodes += 1
+        if self._nodes % self.CHECK_EVERY == 0:
+            self._check_stop()
+
+        self._evaluate(count, sums, chosen)
+        if count >= self._max_count:
+            return
+
+        n = len(self._rows)
+        # Блюд после j не хватит до минимума - дальше по j только хуже
+        last = n - max(self._min_count - count - 1, 0)
+        children = []
+        for j in range(start, last):
+            child = [s + v for s, v in zip(sums, self._rows[j])]
+            bound = self._bound(j + 1, count + 1, child)
+            if bound < self._best_score - 1e-9:
+                children.append((bound, j, child))
+
+        # Сначала самые перспективные ветви: хороший план находится раньше
+        # и отсекает больше остальных
+        children.sort(key=lambda item: item[0])
+        for bound, j, child in children:
+            if bound >= self._best_score - 1e-9:
+                break
+            chosen.append(j)
+            self._search(j + 1, count + 1, child, chosen)
+            chosen.pop()
+
+    def _search_levels(self, beam: Optional[int] = None) -> None:
+        """
+        Обход дерева по уровням. Фронт уровня - массивы выбранных блюд и их
+        сумм; каждый узел порождает потомков со всеми блюдами после последнего
+        выбранного. Потомки сначала проверяются как готовые планы (рекорд),
+        затем в следующий уровень проходят только те, чья граница ниже рекорда.
+        """
+        n = len(self._rows)
+        target = np.asarray(self._target)
+        chosen = np.empty((1, 0), dtype=np.int64)
+        sums = np.zeros((1, len(_ROW_KEYS)))
+
+        for level in range(1, self._max_count + 1):
+            starts = chosen[:, -1] + 1 if level > 1 else np.zeros(1, dtype=np.int64)
+            counts = n - starts
+            next_chosen, next_sums, next_bounds = [], [], []
+
+            for lo, hi in self._chunks(counts):
+                self._check_stop()
+                sizes = counts[lo:hi]
+                parent = np.repeat(np.arange(lo, hi), sizes)
+                offsets = np.cumsum(sizes) - sizes
+                j = np.arange(int(sizes.sum())) - np.repeat(offsets - starts[lo:hi], sizes)
+                if not len(j):
+                    continue
+                child = sums[parent] + self._rows_np[j]
+                self._nodes += len(j)
+
+                if level >= self._min_count:
+                    price = child[:, _PRICE]
+                    scores = self.PRICE_WEIGHT * price + np.abs(target - child[:, :_PRICE]).sum(axis=1)
+                    scores[price > self._price_cap] = np.inf
+                    i = int(np.argmin(scores))
+                    if scores[i] < self._best_score:
+                        self._best_score = float(scores[i])
+                        self._best = chosen[parent[i]].tolist() + [int(j[i])]
+
+                if level < self._max_count:
+                    bounds = self._level_bounds(child, j, level, target)
+                    keep = bounds < self._best_score - 1e-9
+                    next_chosen.append(np.column_stack([chosen[parent[keep]], j[keep]]))
+                    next_sums.append(child[keep])
+                    next_bounds.append(bounds[keep])
+
+            self._report(self._nodes, self._best_score)
+            if not next_chosen:
+                return
+            # Рекорд мог улучшиться на следующих кусках уровня - отсекаем ещё раз
+            bounds = np.concatenate(next_bounds)
+            keep = bounds < self._best_score - 1e-9
+            if beam is not None and keep.sum() > beam:
+                # Лучевой поиск: в уровне остаются только beam лучших по границе
+                best = np.argpartition(np.where(keep, bounds, np.inf), beam - 1)[:beam]
+                keep = np.zeros(len(bounds), dtype=bool)
+                keep[best] = True
+            chosen = np.concatenate(next_chosen)[keep]
+            sums = np.concatenate(next_sums)[keep]
+            if not len(chosen):
+                return
+
+    def _chunks(self, counts: 'np.ndarray'):
+        """Делит фронт на куски примерно по LEVEL_CHUNK потомков"""
+        ends = np.cumsum(counts)
+        lo = 0
+        while lo < len(counts):
+            base = ends[lo - 1] if lo else 0
+            hi = int(np.searchsorted(ends, base + self.LEVEL_CHUNK, side='right'))
+            hi = max(hi, lo + 1)
+            yield lo, hi
+            lo = hi
+
+    def _level_bounds(self, child: 'np.ndarray', j: 'np.ndarray', level: int,
+                      target: 'np.ndarray') -> 'np.ndarray':
+        """Матричный аналог _bound() для потомков уровня level"""
+        n = len(self._rows)
+        need = max(self._min_count - level, 0)
+        room = self._max_count - level
+        gaps = target - child[:, :_PRICE]
+
+        # Грубая граница без учёта общего k (как в _bound при need..room
+        # по каждому показателю отдельно) отсекает большую часть потомков дёшево
+        room_j = np.minimum(room, n - j - 1)
+        low = self._low_np[j + 1, :, need]
+        high = self._high_np[j + 1, :, room_j]
+        price = child[:, _PRICE] + low[:, _PRICE]
+        bounds = (self.PRICE_WEIGHT * price
+                  + np.maximum(low[:, :_PRICE] - gaps, 0).sum(axis=1)
+                  + np.maximum(gaps - high[:, :_PRICE], 0).sum(axis=1))
+        bounds[price > self._price_cap] = np.inf
+
+        rest = np.flatnonzero(bounds < self._best_score - 1e-9)
+        if len(rest) and room > need:
+            # Точная граница _bound() только для оставшихся; недостижимые k
+            # в таблицах заполнены бесконечностями
+            low = self._low_np[j[rest] + 1, :, need:room + 1]
+            high = self._high_np[j[rest] + 1, :, need:room + 1]
+            gap = gaps[rest][:, :, None]
+            dist = np.maximum(low[:, :_PRICE] - gap, 0) + np.maximum(gap - high[:, :_PRICE], 0)
+            price = child[rest, _PRICE, None] + low[:, _PRICE]
+            exact = self.PRICE_WEIGHT * price + dist.sum(axis=1)
+            exact[price > self._price_cap] = np.inf
+            bounds[rest] = exact.min(axis=1)
+        return bounds
+
+    def _check_stop(self) -> None:
+        self._report(self._nodes, self._best_score)
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise _SearchStopped()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _SearchStopped()
+
+    def _format_result(self, selected: List[Dish], target: DietTarget,
+                       tolerance: DietTolerance, structure: MealStructure) -> Dict[str, Any]:
+        """Раскладывает блюда по приёмам пищи по кругу и форматирует результат"""
+        meals_plan = [selected[m::structure.num_meals] for m in range(structure.num_meals)]
+        meals_plan = [m for m in meals_plan if m] or [[]]
+
+        output_meals = []
+        for i, meal_dishes in enumerate(meals_plan):
+            output_meals.append({
+                "meal_number": i + 1,
+                "dishes": [{
+                    "name": d.name,
+                    "calories": d.calories,
+                    "price": d.price,
+                    "weight": d.weight,
+                    "recipe": d.recipe
+                } for d in meal_dishes],
+                "meal_totals": self._totals(meal_dishes)
+            })
+
+        totals = self._totals(selected)
+        report_totals = {}
+        tolerance_dict = tolerance.to_dict()
+        for key, target_val in target.to_dict().items():
+            actual = totals[key]
+            tol = tolerance_dict[key]
+            pct = ((actual - target_val) / target_val * 100) if target_val != 0 else 0
+            report_totals[key] = {
+                "target": target_val,
+                "actual": round(actual, 2),
+                "deviation_pct": round(pct, 2),
+                "status": "OK" if abs(pct) <= tol else "OUT"
+            }
+
+        return {
+            "status": "success",
+            "method": "BranchAndBound",
+            "daily_totals": report_totals,
+            "total_price": round(totals['price'], 2),
+            "total_weight": round(totals['weight'], 2),
+            "plan": output_meals
+        }
+
+    @staticmethod
+    def _totals(dishes: List[Dish]) -> Dict[str, float]:
+        return {key: sum(getattr(d, key) for d in dishes)
+                for key in ('calories', 'proteins', 'fats', 'carbs', 'price', 'weight')}
@@ -0,0 +1,129 @@
+"""Кэш результатов расчёта: LRU в памяти и (опционально) на диске"""
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional
+from models.dish import Dish, DietTarget, DietTolerance, MealStructure
+from .factory import SolverFactory
+
+
+class SolverCache:
+    """
+    Кэш перед SolverFactory.create(...).solve(...).
+
+    Ключ - хэш содержимого блюд, цели, допусков, структуры и типа решателя,
+    поэтому любое изменение списка блюд даёт новый ключ. В памяти хранится
+    не более max_entries результатов (вытесняются давно не использованные),
+    при заданном cache_dir результаты дополнительно пишутся на диск.
+    """
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def catalogue_hash(dishes: List[Dish]) -> str:
+        """Хэш содержимого списка блюд"""
+        payload = json.dumps([d.to_dict() for d in dishes], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_key(catalogue_hash: str, target: DietTarget, tolerance: DietTolerance,
+                 structure: MealStructure, method: str) -> str:
+        """Ключ кэша для набора параметров"""
+        payload = json.dumps({
+            'dishes': catalogue_hash,
+            'target': asdict(target),
+            'tolerance': asdict(tolerance),
+            'structure': asdict(structure),
+            'method': method
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Возвращает копию результата или None"""
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        elif self.cache_dir:
+            result = self._read_disk(key)
+            if result is not None:
+                self._remember(key, result)
+
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Сохраняет результат в памяти и на диске"""
+        self._remember(key, copy.deepcopy(result))
+        if self.cache_dir:
+            self._write_disk(key, result)
+
+    def clear(self) -> None:
+        """Очищает кэш в памяти (файлы на диске не удаляются)"""
+        self._entries.clear()
+
+    def solve(self, dishes: List[Dish], target: DietTarget, tolerance: DietTolerance,
+              structure: MealStructure, prefer_pulp: bool = True,
+              solver: Optional[object] = None) -> Dict[str, Any]:
+        """
+        Возвращает результат из кэша или решает задачу и кэширует успешный результат
+        (кроме отменённых через stop_event решателя).
+
+        Args:
+            solver: Готовый решатель для этих блюд (иначе создаётся через SolverFactory)
+        """
+        method = SolverFactory.resolve_method(dishes, prefer_pulp)
+        key = self.make_key(self.catalogue_hash(dishes), target, tolerance, structure, method)
+
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        if solver is None:
+            solver = SolverFactory.create(dishes, prefer_pulp)
+        result = solver.solve(target, tolerance, structure)
+
+        # Прерванный расчёт - не лучший найденный результат, его не кэшируем
+        if result.get('status') == 'success' and not result.get('cancelled'):
+            self.put(key, result)
+        return result
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, result: Dict[str, Any]) -> None:
+        path = self._disk_path(key)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
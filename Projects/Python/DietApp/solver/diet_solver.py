@@ -1,15 +1,136 @@
 import itertools
 import random
-from typing import List, Dict, Any, Optional
+from dataclasses import replace
+import time
+from contextlib import nullcontext
+from typing import List, Dict, Any, Iterator, Optional
 from models.dish import Dish, Meal, DietTarget, DietTolerance, MealStructure
+from models.catalog import DishCatalog
+from .local_search import anneal, deviation_bounds
+from .parallel import parallel_best_day
+from .metrics import SolveMetrics, active_hook, emit_metrics
+from .preprocess import PreprocessReport, meal_combinations, prune_dishes
+from .weekly import format_week, week_budget
+from .vectorized import (
+    NUMPY_AVAILABLE, NUTRIENT_KEYS, SCORE_KEYS, MealTable, DeviationBounds,
+    dishes_to_matrix, sample_best_day, dp_best_day
+)
+
+if NUMPY_AVAILABLE:
+    import numpy as np
 
 
 class HeuristicDietSolver:
     """Эвристический решатель задачи оптимальной диеты (без PuLP)"""
 
-    def __init__(self, dishes: List[Dish]):
-        self.dishes = dishes
+    # Сколько лучших вариантов приёма пищи оставлять для сборки дня
+    MEAL_LIMIT = 2000
+    # Число случайных дней в Монте-Карло и размер батча векторной выборки
+    MAX_ITERATIONS = 50000
+    BATCH_SIZE = 4096
+    # Длина отрезка доводки в solve_iter(): между отрезками выдаётся улучшенный план
+    REFINE_SLICE = 0.05
+    # Режим "dp": шаг сетки калорий/БЖУ в долях от идеала на приём пищи
+    # и число состояний, которые остаются в каждом слое DP
+    BUCKET_STEP = 0.25
+    DP_WIDTH = 128
+
+    def __init__(self, dishes: List[Dish], vectorized: Optional[bool] = None,
+                 refine_time: float = 0.0, workers: int = 1, preprocess: bool = True,
+                 assembly: str = "sample", instrument: bool = False):
+        """
+        Args:
+            dishes: Список блюд или DishCatalog
+            vectorized: Считать варианты приёмов пищи через NumPy
+                        (по умолчанию - если NumPy установлен)
+            refine_time: Время (сек) на доводку лучшего дня имитацией отжига,
+                         0 - без доводки
+            workers: Число процессов с независимыми цепочками поиска
+                     (работает в векторизованном режиме)
+            preprocess: Убирать перед генерацией вариантов лишние копии блюд
+                        с одинаковыми показателями (см. prune_dishes)
+            assembly: Сборка дня: "sample" - Монте-Карло по MEAL_LIMIT лучшим
+                      вариантам, "dp" - самый дешёвый вариант в каждой ячейке
+                      сетки и DP по ячейкам (нужен NumPy, иначе "sample")
+            instrument: Добавлять в результат solve() метрики расчёта
+                        (result["metrics"]: время фаз, число вариантов и итераций)
+        """
+        if assembly not in ("sample", "dp"):
+            raise ValueError(f"Неизвестный режим сборки дня: {assembly}")
+        # Для DishCatalog строки создаются один раз: планы и solve_week
+        # ссылаются на одни и те же объекты, а матрица берётся из столбцов
+        self.catalog = dishes if isinstance(dishes, DishCatalog) else None
+        self.dishes = list(dishes) if self.catalog is not None else dishes
+        self.refine_time = refine_time
+        self.workers = max(1, workers)
+        self.preprocess = preprocess
+        # Отчёт последней предобработки (None - предобработка не выполнялась)
+        self.preprocess_report: Optional[PreprocessReport] = None
         self.possible_meals: List[Meal] = []
+        self.vectorized = NUMPY_AVAILABLE if vectorized is None else (vectorized and NUMPY_AVAILABLE)
+        self.assembly = assembly if self.vectorized else "sample"
+        self.meal_table: Optional[MealTable] = None
+        # Матрица показателей блюд, общая для всех вызовов solve()
+        self._matrix = None
+        # Вызывается как progress_callback({"phase", "iteration", "total", "best_score"})
+        self.progress_callback = None
+        # threading.Event: если установлен, поиск завершается досрочно с лучшим найденным днём
+        self.stop_event = None
+        # Получает метрики каждого solve(); None - обработчик из set_metrics_hook()
+        self.instrument = instrument
+        self.metrics_hook = None
+        self._metrics: Optional[SolveMetrics] = None
+
+    def _report(self, phase: str, iteration: int, total: int, best_score: float):
+        """Передаёт прогресс расчёта в progress_callback"""
+        if self.progress_callback is not None:
+            self.progress_callback({
+                "phase": phase,
+                "iteration": iteration,
+                "total": total,
+                "best_score": best_score
+            })
+
+    def _cancelled(self) -> bool:
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def _phase(self, name: str):
+        """Замер фазы для текущего solve() (вне solve() ничего не делает)"""
+        return self._metrics.phase(name) if self._metrics is not None else nullcontext()
+
+    def _count(self, name: str, amount: int) -> None:
+        if self._metrics is not None:
+            self._metrics.count(name, amount)
+
+    def _start_metrics(self) -> None:
+        """Метрики собираются, только если их есть кому отдать"""
+        if self.instrument or active_hook(self.metrics_hook) is not None:
+            self._metrics = SolveMetrics("Heuristic")
+        else:
+            self._metrics = None
+
+    def _finish_metrics(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Кладёт метрики в результат (при instrument) и передаёт их в мониторинг"""
+        if self._metrics is None:
+            return result
+        metrics = self._metrics.to_dict()
+        self._metrics = None
+        if self.instrument:
+            result["metrics"] = metrics
+        emit_metrics(metrics, self.metrics_hook)
+        return result
+
+    def _exit_reason(self, day: Optional[Dict[str, Any]]) -> str:
+        """Почему поиск остановился"""
+        if self._cancelled():
+            return "cancelled"
+        if day is None:
+            return "no_solution"
+        if day['score'] == 0:
+            return "zero_penalty"
+        if self.refine_time > 0:
+            return "time_budget"
+        return "dp_complete" if self.assembly == "dp" else "max_iterations"
 
     def _calculate_totals(self, dishes: List[Dish]) -> Dict[str, float]:
         """Считает суммарные показатели для списка блюд"""
@@ -30,12 +151,14 @@ class HeuristicDietSolver:
             totals['weight'] += dish.weight
         return totals
 
-    def _generate_possible_meals(self, structure: MealStructure) -> List[Meal]:
+    def _generate_possible_meals(self, structure: MealStructure,
+                                 dishes: Optional[List[Dish]] = None) -> List[Meal]:
         """Генерирует все возможные варианты одного приема пищи"""
         possible_meals = []
+        dishes = self.dishes if dishes is None else dishes
         
         for r in range(structure.min_dishes_per_meal, structure.max_dishes_per_meal + 1):
-            for combo in itertools.combinations(self.dishes, r):
+            for combo in itertools.combinations(dishes, r):
                 totals = self._calculate_totals(list(combo))
                 meal = Meal(dishes=list(combo), totals=totals)
                 possible_meals.append(meal)
@@ -72,63 +195,439 @@ class HeuristicDietSolver:
         if not self.dishes:
             return {"status": "error", "message": "Список блюд пуст", "method": "Heuristic"}
 
-        # 1. Генерация всех возможных вариантов одного приема пищи
-        self.possible_meals = self._generate_possible_meals(structure)
-        
-        if not self.possible_meals:
+        self._start_metrics()
+        self._count("dishes", len(self.dishes))
+
+        # 1-2. Варианты одного приёма пищи
+        if not self._prepare_meals(target, structure):
+            if self._metrics is not None:
+                self._metrics.exit_reason = "no_meals"
+            return self._finish_metrics(
+                {"status": "error", "message": "Не удалось сгенерировать варианты", "method": "Heuristic"}
+            )
+
+        # 3-4. Сборка и доводка дня
+        best_day = self._search_day(target, tolerance, structure)
+        if self._metrics is not None:
+            self._metrics.exit_reason = self._exit_reason(best_day)
+        with self._phase("format"):
+            result = self._format_result(best_day, target, tolerance)
+        if self.preprocess_report is not None and result['status'] == 'success':
+            result["preprocess"] = self.preprocess_report.to_dict()
+        if self._cancelled():
+            result["cancelled"] = True
+        return self._finish_metrics(result)
+
+    def solve_iter(self, target: DietTarget, tolerance: DietTolerance,
+                   structure: MealStructure) -> Iterator[Dict[str, Any]]:
+        """
+        Anytime-вариант solve(): выдаёт план каждый раз, когда найден день лучше предыдущего.
+
+        Сначала идут улучшения Монте-Карло, затем (при refine_time > 0) - доводки
+        отжигом отрезками по REFINE_SLICE секунд. Последний выданный план - тот же,
+        что вернул бы solve(). Поиск идёт только пока генератор читают, поэтому
+        его можно бросить в любой момент, например по истечении дедлайна.
+        При workers > 1 план выдаётся один раз, после завершения всех цепочек.
+
+        В каждом плане дополнительно есть "score" - штраф дня (0 - все показатели в допуске).
+        """
+        if not self.dishes:
+            yield {"status": "error", "message": "Список блюд пуст", "method": "Heuristic"}
+            return
+
+        if not self._prepare_meals(target, structure):
+            yield {"status": "error", "message": "Не удалось сгенерировать варианты", "method": "Heuristic"}
+            return
+
+        if self.assembly == "dp":
+            days = iter([self._assemble_day_dp(target, tolerance, structure)])
+        elif self.vectorized and self.workers > 1:
+            days = iter([self._assemble_day_parallel(target, tolerance, structure)])
+        elif self.vectorized:
+            days = self._iter_assemble_day_vectorized(target, tolerance, structure)
+        else:
+            days = self._iter_assemble_day(target, tolerance, structure)
+
+        best_day = None
+        for day in days:
+            if day is None:
+                break
+            best_day = day
+            yield self._format_iter_result(best_day, target, tolerance)
+
+        if best_day is None:
+            yield self._format_result(None, target, tolerance)
+            return
+
+        if self.workers > 1 and self.vectorized and self.assembly != "dp":
+            return
+
+        # Доводка отрезками: каждый стартует с лучшего на данный момент дня
+        deadline = time.perf_counter() + self.refine_time
+        while best_day['score'] > 0 and not self._cancelled():
+            left = deadline - time.perf_counter()
+            if left <= 0:
+                break
+            refined = self._refine_day(best_day, target, tolerance,
+                                       time_budget=min(self.REFINE_SLICE, left))
+            if refined['score'] < best_day['score']:
+                best_day = refined
+                yield self._format_iter_result(best_day, target, tolerance)
+
+    def _format_iter_result(self, day: Dict[str, Any], target: DietTarget,
+                            tolerance: DietTolerance) -> Dict[str, Any]:
+        """Результат для solve_iter(): как у solve(), плюс штраф дня"""
+        result = self._format_result(day, target, tolerance)
+        result["score"] = round(day['score'], 4)
+        if self._cancelled():
+            result["cancelled"] = True
+        return result
+
+    def solve_week(self, target: DietTarget, tolerance: DietTolerance,
+                   structure: MealStructure, days: int = 7,
+                   max_repeats_per_dish: int = 2,
+                   weekly_budget: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Подбор рациона на несколько дней за один проход.
+
+        Варианты приёмов пищи генерируются один раз на всю неделю. Дни
+        собираются по очереди: варианты с блюдами, исчерпавшими лимит
+        повторов, исключаются, а цена дня ограничивается остатком бюджета.
+        """
+        if not self.dishes:
+            return {"status": "error", "message": "Список блюд пуст", "method": "Heuristic"}
+
+        # Без предобработки: копии блюда нужны, когда оригинал исчерпал лимит повторов
+        if not self._prepare_meals(target, structure, prune=False):
             return {"status": "error", "message": "Не удалось сгенерировать варианты", "method": "Heuristic"}
 
-        # 2. Оптимизация: сортировка по близости к идеалу
+        dish_index = {id(d): i for i, d in enumerate(self.dishes)}
+        meal_dishes = [{dish_index[id(d)] for d in m.dishes} for m in self.possible_meals]
+        used_days = [0] * len(self.dishes)
+        budget_left = week_budget(target, tolerance, days, weekly_budget)
+
+        day_results = []
+        for day in range(days):
+            candidates = [j for j, idxs in enumerate(meal_dishes)
+                          if all(used_days[i] < max_repeats_per_dish for i in idxs)]
+            if not candidates:
+                return {"status": "error", "method": "Heuristic",
+                        "message": f"Не хватает блюд для дня {day + 1} с учётом лимита повторов"}
+
+            day_target = replace(target, price=min(target.price, budget_left / (days - day)))
+            best_day = self._search_day(day_target, tolerance, structure, candidates)
+            if not best_day:
+                return self._format_result(None, target, tolerance)
+
+            for i in set().union(*(meal_dishes[j] for j in best_day['indices'])):
+                used_days[i] += 1
+            budget_left -= best_day['totals']['price']
+            day_results.append(self._format_result(best_day, target, tolerance))
+
+        return format_week(day_results, "Heuristic")
+
+    def _dish_matrix(self) -> 'np.ndarray':
+        """Матрица показателей блюд (строится один раз на набор блюд)"""
+        if self._matrix is None:
+            self._matrix = dishes_to_matrix(self.catalog if self.catalog is not None else self.dishes)
+        return self._matrix
+
+    def _prepare_meals(self, target: DietTarget, structure: MealStructure,
+                       prune: bool = True) -> bool:
+        """Генерирует и отбирает лучшие варианты приёма пищи в self.possible_meals"""
         ideal_per_meal = {k: v / structure.num_meals for k, v in target.to_dict().items()}
-        self.possible_meals.sort(key=lambda m: self._meal_score(m, ideal_per_meal))
-        
-        # Оставляем топ вариантов для ускорения
-        limit = 2000
-        if len(self.possible_meals) > limit:
-            self.possible_meals = self.possible_meals[:limit]
 
-        # 3. Сборка дня из приемов пищи (Монте-Карло)
+        # 0. Предобработка: в одном приёме пищи больше max_dishes_per_meal копий
+        # блюда не понадобится; цена входит в штраф, поэтому группы - с учётом цены
+        dishes, kept = self.dishes, None
+        self.preprocess_report = None
+        if self.preprocess and prune:
+            with self._phase("preprocess"):
+                kept, self.preprocess_report = prune_dishes(
+                    self.catalog if self.catalog is not None else self.dishes, structure,
+                    max_copies=structure.max_dishes_per_meal, price_sensitive=True
+                )
+            if len(kept) < len(self.dishes):
+                dishes = [self.dishes[i] for i in kept]
+            else:
+                kept = None
+
+        self._count("combinations", meal_combinations(len(dishes), structure))
+
+        if self.assembly == "dp":
+            # 1-2. Самый дешёвый вариант в каждой ячейке сетки вместо MEAL_LIMIT лучших
+            with self._phase("generation"):
+                matrix = self._dish_matrix()
+                self.meal_table = MealTable.build_buckets(
+                    matrix if kept is None else matrix[kept],
+                    structure.min_dishes_per_meal,
+                    structure.max_dishes_per_meal,
+                    ideal_per_meal,
+                    self._bucket_steps(ideal_per_meal)
+                )
+                self.possible_meals = self.meal_table.to_meals(dishes)
+        elif self.vectorized:
+            # 1-2. Все сочетания считаются матрично, Meal создаются только для лучших
+            with self._phase("generation"):
+                matrix = self._dish_matrix()
+                self.meal_table = MealTable.build(
+                    matrix if kept is None else matrix[kept],
+                    structure.min_dishes_per_meal,
+                    structure.max_dishes_per_meal,
+                    ideal_per_meal,
+                    self.MEAL_LIMIT
+                )
+                self.possible_meals = self.meal_table.to_meals(dishes)
+        else:
+            # 1. Генерация всех возможных вариантов одного приема пищи
+            with self._phase("generation"):
+                self.possible_meals = self._generate_possible_meals(structure, dishes)
+
+            # 2. Оптимизация: сортировка по близости к идеалу
+            with self._phase("sort"):
+                self.possible_meals.sort(key=lambda m: self._meal_score(m, ideal_per_meal))
+
+            # Оставляем топ вариантов для ускорения
+            if len(self.possible_meals) > self.MEAL_LIMIT:
+                self.possible_meals = self.possible_meals[:self.MEAL_LIMIT]
+
+        self._count("candidate_meals", len(self.possible_meals))
+        return bool(self.possible_meals)
+
+    def _search_day(self, target: DietTarget, tolerance: DietTolerance,
+                    structure: MealStructure,
+                    candidates: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Собирает лучший день из self.possible_meals.
+
+        Args:
+            candidates: Индексы допустимых вариантов (по умолчанию - все)
+        """
+        # 3. Сборка дня из приемов пищи (Монте-Карло или DP по ячейкам)
+        parallel = (self.vectorized and self.workers > 1 and candidates is None
+                    and self.assembly != "dp")
+        with self._phase("search"):
+            if self.assembly == "dp":
+                best_day = self._assemble_day_dp(target, tolerance, structure, candidates)
+            elif parallel:
+                # Цепочки в воркерах уже включают доводку отжигом
+                best_day = self._assemble_day_parallel(target, tolerance, structure)
+            elif self.vectorized:
+                best_day = self._assemble_day_vectorized(target, tolerance, structure, candidates)
+            else:
+                best_day = self._assemble_day(target, tolerance, structure, candidates)
+
+        # 4. Доводка локальным поиском
+        if not parallel and best_day and best_day['score'] > 0 and self.refine_time > 0:
+            with self._phase("refine"):
+                best_day = self._refine_day(best_day, target, tolerance, candidates)
+
+        return best_day
+
+    def _assemble_day(self, target: DietTarget, tolerance: DietTolerance,
+                      structure: MealStructure,
+                      candidates: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+        """Сборка дня случайным перебором (чистый Python)"""
+        return self._last(self._iter_assemble_day(target, tolerance, structure, candidates))
+
+    @staticmethod
+    def _last(days: Iterator[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Последний (лучший) день из генератора улучшений"""
         best_day = None
+        for best_day in days:
+            pass
+        return best_day
+
+    def _iter_assemble_day(self, target: DietTarget, tolerance: DietTolerance,
+                           structure: MealStructure,
+                           candidates: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Случайный перебор дней, выдаёт каждый день лучше предыдущего"""
         best_total_score = float('inf')
-        max_iterations = 50000
+        tolerance_dict = tolerance.to_dict()
+        target_dict = target.to_dict()
+
+        meal_range = range(len(self.possible_meals)) if candidates is None else candidates
+
+        done = 0
+        try:
+            for iteration in range(self.MAX_ITERATIONS):
+                if iteration % 1000 == 0:
+                    if self._cancelled():
+                        break
+                    self._report("search", iteration, self.MAX_ITERATIONS, best_total_score)
 
-        for _ in range(max_iterations):
-            day_plan = random.choices(self.possible_meals, k=structure.num_meals)
+                day_indices = random.choices(meal_range, k=structure.num_meals)
+                done = iteration + 1
+                day_plan = [self.possible_meals[i] for i in day_indices]
             
-            # Суммируем показатели за день
-            day_totals = {
-                'calories': 0, 'price': 0, 'proteins': 0, 
-                'fats': 0, 'carbs': 0, 'weight': 0
-            }
-            for meal in day_plan:
-                for k, v in meal.totals.items():
-                    day_totals[k] += v
+                # Суммируем показатели за день
+                day_totals = {
+                    'calories': 0, 'price': 0, 'proteins': 0, 
+                    'fats': 0, 'carbs': 0, 'weight': 0
+                }
+                for meal in day_plan:
+                    for k, v in meal.totals.items():
+                        day_totals[k] += v
             
-            # Считаем общий штраф
-            current_score = 0
-            tolerance_dict = tolerance.to_dict()
-            target_dict = target.to_dict()
+                # Считаем общий штраф
+                current_score = 0
+                for key in ['calories', 'proteins', 'fats', 'carbs', 'price']:
+                    dev = self._get_deviation_score(
+                        day_totals[key], 
+                        target_dict[key], 
+                        tolerance_dict[key]
+                    )
+                    current_score += dev
             
-            for key in ['calories', 'proteins', 'fats', 'carbs', 'price']:
-                dev = self._get_deviation_score(
-                    day_totals[key], 
-                    target_dict[key], 
-                    tolerance_dict[key]
-                )
-                current_score += dev
-            
-            if current_score < best_total_score:
-                best_total_score = current_score
-                best_day = {
-                    'meals': day_plan,
-                    'totals': day_totals,
-                    'score': current_score
-                }
+                if current_score < best_total_score:
+                    best_total_score = current_score
+                    yield {
+                        'meals': day_plan,
+                        'indices': day_indices,
+                        'totals': day_totals,
+                        'score': current_score
+                    }
                 
-                if current_score == 0:
-                    break
+                    if current_score == 0:
+                        break
+        finally:
+            self._count("iterations", done)
+
+    def _assemble_day_vectorized(self, target: DietTarget, tolerance: DietTolerance,
+                                 structure: MealStructure,
+                                 candidates: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+        """Сборка дня батчами индексов по таблице self.meal_table"""
+        return self._last(self._iter_assemble_day_vectorized(target, tolerance, structure, candidates))
+
+    def _iter_assemble_day_vectorized(self, target: DietTarget, tolerance: DietTolerance,
+                                      structure: MealStructure,
+                                      candidates: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Векторная выборка по батчу за раз, выдаёт каждый день лучше предыдущего"""
+        meal_totals = self.meal_table.totals
+        if candidates is not None:
+            meal_totals = meal_totals[candidates]
+
+        bounds = DeviationBounds(target.to_dict(), tolerance.to_dict())
+        rng = np.random.default_rng()
+        best_score = float('inf')
+        done = 0
 
-        return self._format_result(best_day, target, tolerance)
+        while done < self.MAX_ITERATIONS and not self._cancelled():
+            size = min(self.BATCH_SIZE, self.MAX_ITERATIONS - done)
+            score, idx, day_totals = sample_best_day(
+                meal_totals, structure.num_meals, bounds, size, size, rng
+            )
+            done += size
+            self._count("iterations", done)
+            self._report("search", done, self.MAX_ITERATIONS, min(score, best_score))
+            if idx is None or score >= best_score:
+                continue
+
+            best_score = score
+            indices = idx.tolist()
+            if candidates is not None:
+                indices = [candidates[i] for i in indices]
+
+            yield {
+                'meals': [self.possible_meals[i] for i in indices],
+                'indices': indices,
+                'totals': dict(zip(NUTRIENT_KEYS, day_totals.tolist())),
+                'score': score
+            }
+
+            if score == 0:
+                break
+
+    def _bucket_steps(self, ideal_per_meal: Dict[str, float]) -> 'np.ndarray':
+        """Шаг сетки по SCORE_KEYS (для нулевой цели - 1 единица)"""
+        return np.array([ideal_per_meal[key] * self.BUCKET_STEP if ideal_per_meal[key] > 0 else 1.0
+                         for key in SCORE_KEYS])
+
+    def _assemble_day_dp(self, target: DietTarget, tolerance: DietTolerance,
+                         structure: MealStructure,
+                         candidates: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+        """Сборка дня динамическим программированием по ячейкам self.meal_table"""
+        meal_totals = self.meal_table.totals
+        if candidates is not None:
+            meal_totals = meal_totals[candidates]
+
+        ideal_per_meal = {k: v / structure.num_meals for k, v in target.to_dict().items()}
+        score, idx, day_totals = dp_best_day(
+            meal_totals, structure.num_meals,
+            DeviationBounds(target.to_dict(), tolerance.to_dict()),
+            self._bucket_steps(ideal_per_meal), self.DP_WIDTH,
+            stop_event=self.stop_event,
+            progress=lambda layer, best: self._report("dp", layer, structure.num_meals, best)
+        )
+        if idx is None:
+            return None
+
+        indices = idx.tolist()
+        if candidates is not None:
+            indices = [candidates[i] for i in indices]
+        return {
+            'meals': [self.possible_meals[i] for i in indices],
+            'indices': indices,
+            'totals': dict(zip(NUTRIENT_KEYS, day_totals.tolist())),
+            'score': score
+        }
+
+    def _assemble_day_parallel(self, target: DietTarget, tolerance: DietTolerance,
+                               structure: MealStructure) -> Optional[Dict[str, Any]]:
+        """Сборка дня в self.workers процессах, побеждает лучший результат"""
+        score, indices = parallel_best_day(
+            self.meal_table.totals, structure.num_meals,
+            target.to_dict(), tolerance.to_dict(), self.workers,
+            self.MAX_ITERATIONS, self.BATCH_SIZE, self.refine_time,
+            stop_event=self.stop_event,
+            progress=lambda done, best: self._report("chains", done, self.workers, best)
+        )
+        if indices is None:
+            return None
+
+        meals = [self.possible_meals[i] for i in indices]
+        return {
+            'meals': meals,
+            'indices': indices,
+            'totals': self._calculate_totals([d for m in meals for d in m.dishes]),
+            'score': score
+        }
+
+    def _refine_day(self, day: Dict[str, Any], target: DietTarget, tolerance: DietTolerance,
+                    candidates: Optional[List[int]] = None,
+                    time_budget: Optional[float] = None) -> Dict[str, Any]:
+        """Улучшает день имитацией отжига (time_budget секунд, по умолчанию refine_time)"""
+        if self.vectorized:
+            meal_totals = self.meal_table.totals.tolist()
+        else:
+            meal_totals = [[m.totals[k] for k in NUTRIENT_KEYS] for m in self.possible_meals]
+
+        start = day['indices']
+        if candidates is not None:
+            position = {j: pos for pos, j in enumerate(candidates)}
+            meal_totals = [meal_totals[j] for j in candidates]
+            start = [position[j] for j in start]
+
+        bounds = deviation_bounds(target.to_dict(), tolerance.to_dict())
+        score, indices, _ = anneal(
+            meal_totals, start, bounds,
+            self.refine_time if time_budget is None else time_budget,
+            stop_event=self.stop_event,
+            progress=lambda step, best: self._report("refine", step, 0, best)
+        )
+        if score >= day['score']:
+            return day
+
+        if candidates is not None:
+            indices = [candidates[i] for i in indices]
+
+        meals = [self.possible_meals[i] for i in indices]
+        return {
+            'meals': meals,
+            'indices': indices,
+            'totals': self._calculate_totals([d for m in meals for d in m.dishes]),
+            'score': score
+        }
 
     def _format_result(self, result: Optional[Dict], target: DietTarget, 
                        tolerance: DietTolerance) -> Dict[str, Any]:
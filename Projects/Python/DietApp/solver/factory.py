@@ -2,37 +2,78 @@ from typing import List, Optional
 from models.dish import Dish
 from .diet_solver import HeuristicDietSolver
 from .pulp_solver import PulpDietSolver, PULP_AVAILABLE
+from .bnb_solver import BranchAndBoundDietSolver
 
 
 class SolverFactory:
     """Фабрика для создания подходящего решателя"""
 
+    # Доступные методы и их названия для интерфейса
+    METHOD_NAMES = {
+        "pulp": "PuLP (Линейное программирование)",
+        "bnb": "Метод ветвей и границ (точный)",
+        "heuristic": "Эвристический (Монте-Карло)",
+    }
+    # До какого размера каталога без PuLP используется точный перебор
+    BNB_MAX_DISHES = 60
+
+    @staticmethod
+    def resolve_method(dishes: List[Dish], prefer_pulp: bool = True,
+                       method: Optional[str] = None) -> str:
+        """
+        Определяет метод решения: "pulp", "bnb" или "heuristic".
+
+        Явно заданный method используется как есть. Иначе - PuLP, если он
+        доступен и предпочтителен; без PuLP небольшие каталоги решаются
+        точно методом ветвей и границ, большие - эвристикой.
+        """
+        if method is not None:
+            if method not in SolverFactory.METHOD_NAMES:
+                raise ValueError(f"Неизвестный метод решения: {method}")
+            return method
+        if prefer_pulp and PULP_AVAILABLE:
+            return "pulp"
+        if not PULP_AVAILABLE and len(dishes) <= SolverFactory.BNB_MAX_DISHES:
+            return "bnb"
+        return "heuristic"
+
     @staticmethod
-    def create(dishes: List[Dish], prefer_pulp: bool = True) -> Optional[object]:
+    def create(dishes: List[Dish], prefer_pulp: bool = True,
+               method: Optional[str] = None,
+               time_limit: Optional[float] = None) -> Optional[object]:
         """
         Создаёт решатель в зависимости от доступности PuLP.
-        
+
         Args:
             dishes: Список блюд
             prefer_pulp: Предпочитать PuLP если доступен
-        
+            method: Явный выбор метода ("pulp", "bnb", "heuristic")
+            time_limit: Ограничение времени одного solve() в секундах для
+                        PuLP и метода ветвей и границ (эвристика ограничена
+                        числом итераций и его не использует)
+
         Returns:
             Экземпляр решателя или None
         """
-        if prefer_pulp and PULP_AVAILABLE:
-            return PulpDietSolver(dishes)
+        method = SolverFactory.resolve_method(dishes, prefer_pulp, method)
+        if method == "pulp":
+            return PulpDietSolver(dishes, time_limit=time_limit)
+        elif method == "bnb":
+            return BranchAndBoundDietSolver(dishes, time_limit=time_limit)
         else:
             return HeuristicDietSolver(dishes)
 
     @staticmethod
-    def get_method_name() -> str:
+    def get_method_name(method: Optional[str] = None) -> str:
         """Возвращает название используемого метода"""
+        if method is not None:
+            return SolverFactory.METHOD_NAMES[method]
         if PULP_AVAILABLE:
-            return "PuLP (Линейное программирование)"
+            return SolverFactory.METHOD_NAMES["pulp"]
         else:
-            return "Эвристический (Монте-Карло)"
+            return SolverFactory.METHOD_NAMES["heuristic"]
 
     @staticmethod
     def is_pulp_available() -> bool:
         """Проверяет доступность PuLP"""
-        return PULP_AVAILABLE
\ No newline at end of file
+        return PULP_AVAILABLE
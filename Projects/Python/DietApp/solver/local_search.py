@@ -0,0 +1,121 @@
+"""Локальный поиск (имитация отжига) для улучшения найденного дня"""
+import math
+import random
+import time
+from typing import List, Dict, Sequence, Tuple
+from .vectorized import NUTRIENT_KEYS, DEVIATION_KEYS
+
+
+def deviation_bounds(target: Dict[str, float],
+                     tolerance: Dict[str, float]) -> List[Tuple[int, float, float, float]]:
+    """Готовит (столбец, цель, нижняя граница, верхняя граница) для каждого показателя"""
+    bounds = []
+    for key in DEVIATION_KEYS:
+        tgt = target[key]
+        tol = tolerance[key]
+        bounds.append((
+            NUTRIENT_KEYS.index(key),
+            tgt,
+            tgt * (1 - tol / 100),
+            tgt * (1 + tol / 100)
+        ))
+    return bounds
+
+
+def day_penalty(totals: Sequence[float], bounds: List[Tuple[int, float, float, float]]) -> float:
+    """Штраф дня - то же, что сумма HeuristicDietSolver._get_deviation_score"""
+    score = 0.0
+    for col, tgt, lower, upper in bounds:
+        actual = totals[col]
+        if tgt == 0:
+            score += 0 if actual == 0 else 100
+        elif actual < lower:
+            score += (lower - actual) / tgt * 100
+        elif actual > upper:
+            score += (actual - upper) / tgt * 100
+    return score
+
+
+def anneal(meal_totals: List[Sequence[float]], day: List[int],
+           bounds: List[Tuple[int, float, float, float]], time_budget: float,
+           rng=random, start_temp: float = 5.0, end_temp: float = 0.01,
+           patience: int = 5000, stop_event=None,
+           progress=None) -> Tuple[float, List[int], List[float]]:
+    """
+    Имитация отжига над днём из индексов приёмов пищи.
+
+    Шаг - замена одного приёма пищи на случайный из meal_totals. Суммы дня
+    обновляются инкрементально (вычесть старый приём, прибавить новый),
+    поэтому стоимость шага не зависит от числа приёмов пищи. Если за patience
+    шагов лучший результат не улучшился, поиск возвращается к лучшему дню
+    и температура поднимается снова.
+
+    Args:
+        meal_totals: Показатели вариантов приёмов пищи в порядке NUTRIENT_KEYS
+        day: Начальный день (индексы в meal_totals)
+        bounds: Результат deviation_bounds()
+        time_budget: Время работы в секундах
+        rng: Источник случайных чисел (random или random.Random)
+        start_temp, end_temp: Температура в начале и в конце цикла остывания
+        patience: Число шагов без улучшения до повторного нагрева
+        stop_event: Event для досрочной остановки извне
+        progress: Вызывается как progress(шаг, лучший штраф) раз в 256 шагов
+
+    Returns: (лучший штраф, индексы лучшего дня, показатели лучшего дня)
+    """
+    n_candidates = len(meal_totals)
+    current = list(day)
+    totals = [0.0] * len(NUTRIENT_KEYS)
+    for i in current:
+        for k, v in enumerate(meal_totals[i]):
+            totals[k] += v
+    score = day_penalty(totals, bounds)
+
+    best_score, best_day, best_totals = score, list(current), list(totals)
+    if score == 0 or n_candidates < 2 or not current or time_budget <= 0:
+        return best_score, best_day, best_totals
+
+    started = time.perf_counter()
+    deadline = started + time_budget
+    cycle_start = started
+    cooling = math.log(end_temp / start_temp)
+    temp = start_temp
+    step = 0
+    stale = 0
+
+    while True:
+        step += 1
+        stale += 1
+        if step % 256 == 0:
+            now = time.perf_counter()
+            if now >= deadline or (stop_event is not None and stop_event.is_set()):
+                break
+            if progress is not None:
+                progress(step, best_score)
+            if stale > patience:
+                current, totals, score = list(best_day), list(best_totals), best_score
+                cycle_start = now
+                stale = 0
+            temp = start_temp * math.exp(cooling * min((now - cycle_start) / time_budget, 1.0))
+
+        pos = rng.randrange(len(current))
+        old = meal_totals[current[pos]]
+        cand_idx = rng.randrange(n_candidates)
+        new = meal_totals[cand_idx]
+
+        candidate = [t - o + c for t, o, c in zip(totals, old, new)]
+        cand_score = day_penalty(candidate, bounds)
+        delta = cand_score - score
+
+        if delta <= 0 or rng.random() < math.exp(-delta / temp):
+            current[pos] = cand_idx
+            totals = candidate
+            score = cand_score
+
+            if score < best_score:
+                best_score, best_day, best_totals = score, list(current), list(totals)
+                stale = 0
+                if best_score == 0:
+                    break
+
+    return best_score, best_day, best_totals
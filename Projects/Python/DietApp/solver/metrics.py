@@ -0,0 +1,99 @@
+"""Замеры расчёта по фазам и передача их во внешний мониторинг"""
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, Optional
+
+
+# Общий обработчик для всех решателей (например, отправка в мониторинг)
+_default_hook: Optional[Callable[[Dict[str, Any]], None]] = None
+
+
+def set_metrics_hook(hook: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+    """
+    Задаёт обработчик метрик по умолчанию.
+
+    Вызывается как hook(metrics) после каждого solve() решателей, у которых
+    не задан собственный metrics_hook. None - отключить.
+    """
+    global _default_hook
+    _default_hook = hook
+
+
+class SolveMetrics:
+    """
+    Метрики одного расчёта.
+
+    phases - время фаз в секундах в порядке выполнения, counters - числовые
+    показатели (варианты приёмов пищи, итерации, узлы CBC), exit_reason -
+    почему поиск остановился.
+    """
+
+    def __init__(self, method: str):
+        self.method = method
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.exit_reason: Optional[str] = None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Замеряет фазу; повторные замеры одной фазы складываются"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name: str, value: int) -> None:
+        self.counters[name] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "total_time": round(time.perf_counter() - self._started, 6),
+            "phases": {name: round(sec, 6) for name, sec in self.phases.items()},
+            "counters": dict(self.counters),
+            "exit_reason": self.exit_reason,
+        }
+
+
+def active_hook(hook: Optional[Callable[[Dict[str, Any]], None]] = None
+                ) -> Optional[Callable[[Dict[str, Any]], None]]:
+    """Обработчик, который получит метрики: hook решателя или общий"""
+    return hook or _default_hook
+
+
+def emit_metrics(metrics: Dict[str, Any],
+                 hook: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+    """
+    Передаёт метрики в hook решателя или в обработчик по умолчанию.
+    Ошибка мониторинга не должна ломать расчёт, поэтому исключения глушатся.
+    """
+    hook = active_hook(hook)
+    if hook is None:
+        return
+    try:
+        hook(metrics)
+    except Exception:
+        pass
+
+
+_CBC_PATTERNS = {
+    "cbc_nodes": re.compile(r"Enumerated nodes:\s+(\d+)"),
+    "cbc_iterations": re.compile(r"Total iterations:\s+(\d+)"),
+}
+_CBC_RESULT = re.compile(r"^Result - (.+)$", re.MULTILINE)
+
+
+def parse_cbc_log(text: str) -> Dict[str, Any]:
+    """Число узлов и итераций и итог CBC из его лога (logPath)"""
+    stats: Dict[str, Any] = {}
+    for key, pattern in _CBC_PATTERNS.items():
+        found = pattern.findall(text)
+        if found:
+            stats[key] = int(found[-1])
+    result = _CBC_RESULT.findall(text)
+    if result:
+        stats["cbc_result"] = result[-1].strip()
+    return stats
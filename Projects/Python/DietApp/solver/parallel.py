@@ -0,0 +1,100 @@
+"""Параллельный эвристический поиск: независимые цепочки в пуле процессов"""
+import random
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional, Tuple
+from .local_search import anneal, deviation_bounds
+from .vectorized import NUMPY_AVAILABLE, DeviationBounds, sample_best_day
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+    from multiprocessing import shared_memory
+
+# Состояние процесса-воркера (заполняется в _init_worker)
+_worker_state: Dict[str, object] = {}
+
+
+def _init_worker(shm_name: str, shape: Tuple[int, int], stop_event) -> None:
+    """Инициализация воркера: таблица приёмов пищи читается из общей памяти"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_state['shm'] = shm
+    _worker_state['totals'] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker_state['stop'] = stop_event
+
+
+def _run_chain(seed: int, num_meals: int, target: Dict[str, float],
+               tolerance: Dict[str, float], iterations: int, batch_size: int,
+               refine_time: float) -> Tuple[float, List[int]]:
+    """Одна цепочка: Монте-Карло и (опционально) отжиг со своим зерном"""
+    totals = _worker_state['totals']
+    stop = _worker_state['stop']
+
+    score, idx, _ = sample_best_day(
+        totals, num_meals, DeviationBounds(target, tolerance),
+        iterations, batch_size, np.random.default_rng(seed), stop_event=stop
+    )
+    if idx is None:
+        return float('inf'), []
+    day = idx.tolist()
+
+    if score > 0 and refine_time > 0:
+        score, day, _ = anneal(
+            totals.tolist(), day, deviation_bounds(target, tolerance),
+            refine_time, random.Random(seed), stop_event=stop
+        )
+
+    if score == 0:
+        stop.set()
+    return score, day
+
+
+def parallel_best_day(meal_totals: 'np.ndarray', num_meals: int,
+                      target: Dict[str, float], tolerance: Dict[str, float],
+                      workers: int, iterations: int, batch_size: int,
+                      refine_time: float = 0.0, seed: Optional[int] = None,
+                      stop_event=None, progress=None) -> Tuple[float, Optional[List[int]]]:
+    """
+    Запускает workers независимых цепочек поиска в пуле процессов.
+
+    Таблица приёмов пищи кладётся в multiprocessing.shared_memory один раз,
+    воркеры читают её без копирования. Первая цепочка, нашедшая день
+    с нулевым штрафом, останавливает остальные через общий Event.
+    Внешний stop_event (например, из GUI) также останавливает все цепочки,
+    progress(число завершённых цепочек, лучший штраф) вызывается по мере их завершения.
+
+    Returns: (лучший штраф, индексы приёмов пищи лучшего дня)
+    """
+    ctx = mp.get_context()
+    shared_stop = ctx.Event()
+    totals = np.ascontiguousarray(meal_totals, dtype=np.float64)
+    shm = shared_memory.SharedMemory(create=True, size=max(totals.nbytes, 1))
+
+    try:
+        np.ndarray(totals.shape, dtype=np.float64, buffer=shm.buf)[:] = totals
+        seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(workers)]
+
+        best_score, best_day = float('inf'), None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker,
+                                 initargs=(shm.name, totals.shape, shared_stop)) as pool:
+            pending = {
+                pool.submit(_run_chain, s, num_meals, target, tolerance,
+                            iterations, batch_size, refine_time)
+                for s in seeds
+            }
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    score, day = future.result()
+                    if day and score < best_score:
+                        best_score, best_day = score, day
+                    if progress is not None:
+                        progress(len(seeds) - len(pending), best_score)
+
+                if best_score == 0 or (stop_event is not None and stop_event.is_set()):
+                    shared_stop.set()
+
+        return best_score, best_day
+    finally:
+        shm.close()
+        shm.unlink()
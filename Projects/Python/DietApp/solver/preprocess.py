@@ -0,0 +1,105 @@
+"""Предварительная обработка каталога: дубликаты и заведомо лишние блюда"""
+from dataclasses import dataclass, asdict
+from math import comb
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from models.dish import MealStructure
+from models.catalog import dish_columns
+
+
+# Показатели, по которым блюда сравниваются в целевой функции
+OBJECTIVE_KEYS = ('calories', 'proteins', 'fats', 'carbs')
+
+
+@dataclass
+class PreprocessReport:
+    """Насколько предобработка сократила перебор"""
+    total: int = 0                  # Блюд в каталоге
+    kept: int = 0                   # Блюд осталось
+    duplicates: int = 0             # Лишние копии блюд с одинаковыми показателями
+    over_budget: int = 0            # Блюда дороже дневного бюджета
+    combinations_before: int = 0    # Вариантов одного приёма пищи до обработки
+    combinations_after: int = 0     # ... и после
+
+    @property
+    def removed(self) -> int:
+        return self.total - self.kept
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        """Краткий отчёт для пользователя"""
+        text = f"Блюд: {self.kept} из {self.total}"
+        if self.removed:
+            text += f" (дубликатов {self.duplicates}, дороже бюджета {self.over_budget})"
+        if self.combinations_before:
+            text += (f", вариантов приёма пищи: {self.combinations_after} "
+                     f"из {self.combinations_before}")
+        return text
+
+
+def meal_combinations(n_dishes: int, structure: MealStructure) -> int:
+    """Число вариантов одного приёма пищи из n_dishes блюд"""
+    return sum(comb(n_dishes, r) for r in range(structure.min_dishes_per_meal,
+                                               structure.max_dishes_per_meal + 1))
+
+
+def prune_dishes(dishes: Sequence, structure: MealStructure,
+                 max_copies: Optional[int] = None, max_price: Optional[float] = None,
+                 price_sensitive: bool = False) -> Tuple[List[int], PreprocessReport]:
+    """
+    Отбирает блюда, без которых ответ решателя не меняется.
+
+    Блюда с одинаковыми калориями и БЖУ взаимозаменяемы для целевой функции:
+    из каждой такой группы остаются max_copies самых дешёвых (больше одно
+    решение всё равно не возьмёт). Если цена только штрафуется
+    (price_sensitive, как в эвристике, где дешевле цели - тоже отклонение),
+    группы составляются с учётом цены, т.е. отбрасываются только полные
+    копии. При заданном max_price убираются блюда дороже бюджета - при
+    неотрицательных ценах они не входят ни в одно допустимое решение.
+
+    "Доминирование" по БЖУ не используется: отклонение считается в обе
+    стороны, и блюдо с большим содержанием белка не хуже и не лучше другого.
+
+    Args:
+        dishes: Список блюд или DishCatalog
+        structure: Структура питания (для max_copies и подсчёта вариантов)
+        max_copies: Сколько блюд оставлять в группе (по умолчанию -
+                    максимум блюд за день)
+        max_price: Верхняя граница цены дня
+        price_sensitive: Учитывать цену в группировке
+
+    Returns: (индексы оставленных блюд по возрастанию, отчёт)
+    """
+    if max_copies is None:
+        max_copies = structure.max_dishes_per_meal * structure.num_meals
+    columns = dish_columns(dishes, OBJECTIVE_KEYS + ('price',))
+    prices = columns['price']
+    n = len(prices)
+    report = PreprocessReport(total=n)
+
+    if max_price is not None and all(p >= 0 for p in prices):
+        candidates = [i for i in range(n) if prices[i] <= max_price + 1e-9]
+        report.over_budget = n - len(candidates)
+    else:
+        candidates = range(n)
+
+    key_columns = [columns[key] for key in OBJECTIVE_KEYS]
+    if price_sensitive:
+        key_columns.append(prices)
+
+    taken: Dict[tuple, int] = {}
+    kept = []
+    for i in sorted(candidates, key=lambda i: prices[i]):
+        key = tuple(col[i] for col in key_columns)
+        count = taken.get(key, 0)
+        if count < max_copies:
+            taken[key] = count + 1
+            kept.append(i)
+    kept.sort()
+
+    report.kept = len(kept)
+    report.duplicates = len(candidates) - len(kept)
+    report.combinations_before = meal_combinations(n, structure)
+    report.combinations_after = meal_combinations(len(kept), structure)
+    return kept, report
@@ -1,10 +1,18 @@
-from typing import List, Dict, Any, Optional, Tuple
+import os
+import tempfile
+import time
+from contextlib import nullcontext
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 from models.dish import Dish, Meal, DietTarget, DietTolerance, MealStructure
+from models.catalog import dish_columns
+from .weekly import format_week, week_budget
+from .preprocess import PreprocessReport, prune_dishes
+from .metrics import SolveMetrics, active_hook, emit_metrics, parse_cbc_log
 
 try:
     from pulp import (
         LpProblem, LpMinimize, LpVariable, lpSum, LpBinary,
-        LpStatusOptimal, value, LpStatus
+        LpStatusOptimal, LpStatusNotSolved, LpSolutionOptimal, value, LpStatus, PULP_CBC_CMD
     )
     PULP_AVAILABLE = True
 except ImportError:
@@ -14,94 +22,463 @@ except ImportError:
 class PulpDietSolver:
     """Решатель задачи оптимальной диеты на основе PuLP"""
 
-    def __init__(self, dishes: List[Dish]):
+    # Ограничения по показателям: (ключ, имя ограничения в модели)
+    NUTRIENT_CONSTRAINTS = (
+        ('calories', 'Calories'),
+        ('proteins', 'Proteins'),
+        ('fats', 'Fats'),
+        ('carbs', 'Carbs'),
+    )
+
+    # Вес отклонений отдельных приёмов пищи относительно дневных
+    MEAL_BALANCE_WEIGHT = 0.5
+    # Вес цены в целевой функции (компромисс цена / точность)
+    PRICE_WEIGHT = 0.01
+
+    def __init__(self, dishes: List[Dish], assign_meals: bool = False,
+                 time_limit: Optional[float] = None, preprocess: bool = True,
+                 instrument: bool = False):
+        """
+        Args:
+            dishes: Список блюд
+            assign_meals: Распределять блюда по приёмам пищи в самой модели
+                          (переменные блюдо x приём) вместо раздачи по кругу
+            time_limit: Ограничение времени работы CBC в секундах
+            preprocess: Исключать лишние копии блюд с одинаковыми БЖУ и
+                        блюда дороже бюджета (см. prune_dishes)
+            instrument: Добавлять в результат solve() метрики расчёта
+                        (result["metrics"]: время фаз, узлы CBC и т.д.)
+        """
         self.dishes = dishes
         self.n_dishes = len(dishes)
+        self.assign_meals = assign_meals
+        self.time_limit = time_limit
+        self.preprocess = preprocess
+        self.preprocess_report: Optional[PreprocessReport] = None
+        # Модель строится один раз на набор блюд и переиспользуется между solve()
+        self._prob: Optional['LpProblem'] = None
+        self._x: List['LpVariable'] = []
+        self._y: List[List['LpVariable']] = []
+        self._deviation_expr = None
+        self._meal_deviation_expr = None
+        self._price_expr = None
+        self._model_meals = 0
+        self._has_solution = False
+        # Коэффициенты модели по показателям (столбцы DishCatalog без копирования)
+        self._columns: Optional[Dict[str, Sequence[float]]] = None
+        # Прогресс и отмена (как у HeuristicDietSolver). Сам CBC через PuLP
+        # прервать нельзя, поэтому отмена срабатывает между запусками решателя
+        self.progress_callback = None
+        self.stop_event = None
+        # Получает метрики каждого solve(); None - обработчик из set_metrics_hook()
+        self.instrument = instrument
+        self.metrics_hook = None
+        self._metrics: Optional[SolveMetrics] = None
 
-    def solve(self, target: DietTarget, tolerance: DietTolerance,
-              structure: MealStructure) -> Dict[str, Any]:
+    def _report(self, phase: str, iteration: int, total: int, best_score: float):
+        """Передаёт прогресс расчёта в progress_callback"""
+        if self.progress_callback is not None:
+            self.progress_callback({
+                "phase": phase,
+                "iteration": iteration,
+                "total": total,
+                "best_score": best_score
+            })
+
+    def _phase(self, name: str):
+        """Замер фазы для текущего solve() (вне solve() ничего не делает)"""
+        return self._metrics.phase(name) if self._metrics is not None else nullcontext()
+
+    def _count(self, name: str, amount: int) -> None:
+        if self._metrics is not None:
+            self._metrics.count(name, amount)
+
+    def _start_metrics(self) -> None:
+        """Метрики собираются, только если их есть кому отдать"""
+        if self.instrument or active_hook(self.metrics_hook) is not None:
+            self._metrics = SolveMetrics("PuLP")
+        else:
+            self._metrics = None
+
+    def _finish_metrics(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Кладёт метрики в результат (при instrument) и передаёт их в мониторинг"""
+        if self._metrics is None:
+            return result
+        metrics = self._metrics.to_dict()
+        self._metrics = None
+        if self.instrument:
+            result["metrics"] = metrics
+        emit_metrics(metrics, self.metrics_hook)
+        return result
+
+    def _coefficients(self) -> Dict[str, Sequence[float]]:
+        """Значения показателей блюд по столбцам (собираются один раз)"""
+        if self._columns is None:
+            keys = [key for key, _ in self.NUTRIENT_CONSTRAINTS] + ['price']
+            self._columns = dish_columns(self.dishes, keys)
+        return self._columns
+
+    def _build_model(self, num_meals: int) -> None:
         """
-        Решает задачу оптимизации с помощью PuLP.
-        
+        Строит модель для текущего набора блюд.
+
         Формулировка задачи:
         - Переменные: x_i = 1 если блюдо i выбрано, 0 иначе
         - Ограничения: 
           * БЖУ и калории в пределах допуска
           * Количество блюд в пределах структуры
         - Цель: минимизировать отклонение от целевых значений + цена
-        """
-        
-        if not PULP_AVAILABLE:
-            return {"status": "error", "message": "PuLP не установлен"}
-        
-        if not self.dishes:
-            return {"status": "error", "message": "Список блюд пуст"}
 
-        # Создаём задачу оптимизации
+        При assign_meals добавляются переменные y_im (блюдо i в приёме m),
+        ограничения на число блюд и отклонения БЖУ в каждом приёме.
+
+        Правые части ограничений зависят от цели и структуры, они выставляются
+        в _update_rhs() перед каждым решением.
+        """
         prob = LpProblem("Optimal_Diet", LpMinimize)
+        coef = self._coefficients()
 
         # Переменные решения: x_i = 1 если блюдо i выбрано
         x = [LpVariable(f"dish_{i}", cat=LpBinary) for i in range(self.n_dishes)]
 
-        # Целевая функция: минимизировать отклонения + цена
-        # Используем вспомогательные переменные для отклонений
-        dev_calories_pos = LpVariable("dev_calories_pos", lowBound=0)
-        dev_calories_neg = LpVariable("dev_calories_neg", lowBound=0)
-        dev_proteins_pos = LpVariable("dev_proteins_pos", lowBound=0)
-        dev_proteins_neg = LpVariable("dev_proteins_neg", lowBound=0)
-        dev_fats_pos = LpVariable("dev_fats_pos", lowBound=0)
-        dev_fats_neg = LpVariable("dev_fats_neg", lowBound=0)
-        dev_carbs_pos = LpVariable("dev_carbs_pos", lowBound=0)
-        dev_carbs_neg = LpVariable("dev_carbs_neg", lowBound=0)
-
-        # Минимизируем сумму отклонений (нормированных) + цена
-        prob += (
-            dev_calories_pos + dev_calories_neg +
-            dev_proteins_pos + dev_proteins_neg +
-            dev_fats_pos + dev_fats_neg +
-            dev_carbs_pos + dev_carbs_neg +
-            lpSum([self.dishes[i].price * x[i] for i in range(self.n_dishes)]) * 0.01
-        ), "Objective"
-
-        # Ограничения на БЖУ и калории с допуском
-        tol = tolerance.to_dict()
-        tgt = target.to_dict()
+        # Вспомогательные переменные для отклонений
+        deviations = []
+        for key, name in self.NUTRIENT_CONSTRAINTS:
+            dev_pos = LpVariable(f"dev_{key}_pos", lowBound=0)
+            dev_neg = LpVariable(f"dev_{key}_neg", lowBound=0)
+            deviations += [dev_pos, dev_neg]
 
-        # Калории
-        prob += lpSum([self.dishes[i].calories * x[i] for i in range(self.n_dishes)]) - dev_calories_pos + dev_calories_neg == tgt['calories']
-        
-        # Белки
-        prob += lpSum([self.dishes[i].proteins * x[i] for i in range(self.n_dishes)]) - dev_proteins_pos + dev_proteins_neg == tgt['proteins']
-        
-        # Жиры
-        prob += lpSum([self.dishes[i].fats * x[i] for i in range(self.n_dishes)]) - dev_fats_pos + dev_fats_neg == tgt['fats']
-        
-        # Углеводы
-        prob += lpSum([self.dishes[i].carbs * x[i] for i in range(self.n_dishes)]) - dev_carbs_pos + dev_carbs_neg == tgt['carbs']
+            # Показатель с учётом отклонений равен цели (правая часть - позже)
+            expr = lpSum([coef[key][i] * x[i] for i in range(self.n_dishes)])
+            prob += expr - dev_pos + dev_neg == 0, name
+
+        price_expr = lpSum([coef['price'][i] * x[i] for i in range(self.n_dishes)])
 
         # Ограничения на количество блюд (структура питания)
         # Для упрощения считаем общее количество блюд за день
         total_dishes = lpSum(x)
-        min_total = structure.min_dishes_per_meal * structure.num_meals
-        max_total = structure.max_dishes_per_meal * structure.num_meals
+        prob += total_dishes >= 0, "MinDishes"
+        prob += total_dishes <= 0, "MaxDishes"
+
+        # Ограничение на цену (с допуском)
+        prob += price_expr <= 0, "MaxPrice"
+
+        self._prob = prob
+        self._x = x
+        self._y = self._add_meal_assignment(prob, x, num_meals) if self.assign_meals else []
+        self._deviation_expr = lpSum(deviations)
+        self._price_expr = price_expr
+        self._model_meals = num_meals
+        self._has_solution = False
+
+        # Минимизируем сумму отклонений + цена
+        self._set_objective(self.PRICE_WEIGHT)
+
+    def _set_objective(self, price_weight: float) -> None:
+        """Задаёт целевую функцию: отклонения + price_weight * цена"""
+        objective = self._deviation_expr + self._price_expr * price_weight
+        if self._meal_deviation_expr is not None:
+            objective += self.MEAL_BALANCE_WEIGHT * self._meal_deviation_expr
+        self._prob.setObjective(objective)
+
+    def _add_meal_assignment(self, prob: 'LpProblem', x: List['LpVariable'],
+                             num_meals: int) -> List[List['LpVariable']]:
+        """Добавляет в модель распределение блюд по приёмам пищи"""
+        coef = self._coefficients()
+        dish_range = range(self.n_dishes)
+        y = [[LpVariable(f"dish_{i}_meal_{m}", cat=LpBinary) for m in range(num_meals)]
+             for i in dish_range]
+
+        # Выбранное блюдо попадает ровно в один приём пищи
+        for i in dish_range:
+            prob += lpSum(y[i]) - x[i] == 0, f"Assign_{i}"
+
+        meal_deviations = []
+        for m in range(num_meals):
+            count = lpSum([y[i][m] for i in dish_range])
+            prob += count >= 0, f"Meal_{m}_MinDishes"
+            prob += count <= 0, f"Meal_{m}_MaxDishes"
+
+            for key, name in self.NUTRIENT_CONSTRAINTS:
+                dev_pos = LpVariable(f"dev_meal_{m}_{key}_pos", lowBound=0)
+                dev_neg = LpVariable(f"dev_meal_{m}_{key}_neg", lowBound=0)
+                meal_deviations += [dev_pos, dev_neg]
+                expr = lpSum([coef[key][i] * y[i][m] for i in dish_range])
+                prob += expr - dev_pos + dev_neg == 0, f"Meal_{m}_{name}"
+
+        # Нарушение симметрии: приёмы пищи взаимозаменяемы, поэтому
+        # упорядочиваем их по калорийности и CBC не перебирает перестановки
+        for m in range(num_meals - 1):
+            prob += (
+                lpSum([coef['calories'][i] * (y[i][m] - y[i][m + 1]) for i in dish_range]) >= 0,
+                f"Meal_{m}_Order"
+            )
+
+        self._meal_deviation_expr = lpSum(meal_deviations)
+        return y
+
+    def _update_rhs(self, target: DietTarget, tolerance: DietTolerance,
+                    structure: MealStructure) -> None:
+        """Обновляет правые части ограничений под новую цель и структуру"""
+        tol = tolerance.to_dict()
+        tgt = target.to_dict()
+        constraints = self._prob.constraints
+
+        for key, name in self.NUTRIENT_CONSTRAINTS:
+            constraints[name].changeRHS(tgt[key])
+
+        constraints["MinDishes"].changeRHS(structure.min_dishes_per_meal * structure.num_meals)
+        constraints["MaxDishes"].changeRHS(structure.max_dishes_per_meal * structure.num_meals)
+        constraints["MaxPrice"].changeRHS(tgt['price'] * (1 + tol['price'] / 100))
+
+        if self.assign_meals:
+            for m in range(structure.num_meals):
+                constraints[f"Meal_{m}_MinDishes"].changeRHS(structure.min_dishes_per_meal)
+                constraints[f"Meal_{m}_MaxDishes"].changeRHS(structure.max_dishes_per_meal)
+                for key, name in self.NUTRIENT_CONSTRAINTS:
+                    constraints[f"Meal_{m}_{name}"].changeRHS(tgt[key] / structure.num_meals)
+
+    def solve(self, target: DietTarget, tolerance: DietTolerance,
+              structure: MealStructure) -> Dict[str, Any]:
+        """
+        Решает задачу оптимизации с помощью PuLP.
+
+        Модель строится при первом вызове; при повторных меняются только
+        правые части ограничений, а предыдущее решение передаётся CBC
+        как стартовое (MIP warm start).
+        """
+        
+        if not PULP_AVAILABLE:
+            return {"status": "error", "message": "PuLP не установлен"}
         
-        prob += total_dishes >= min_total, "MinDishes"
-        prob += total_dishes <= max_total, "MaxDishes"
+        if not self.dishes:
+            return {"status": "error", "message": "Список блюд пуст"}
+
+        self._start_metrics()
+        with self._phase("model"):
+            self._prepare_model(target, tolerance, structure)
+        self._count("dishes", self.n_dishes)
+        if self.preprocess_report is not None:
+            self._count("candidate_dishes", self.preprocess_report.kept)
+        if self._metrics is not None:
+            self._count("variables", len(self._prob.variables()))
+
+        result = self._solve_current(target, tolerance, structure)
+        if self.preprocess_report is not None and result['status'] == 'success':
+            result["preprocess"] = self.preprocess_report.to_dict()
+        return self._finish_metrics(result)
+
+    def solve_iter(self, target: DietTarget, tolerance: DietTolerance,
+                   structure: MealStructure, first_time_limit: float = 0.5,
+                   max_time: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Anytime-вариант solve(): выдаёт план каждый раз, когда найдено решение лучше.
 
-        # Ограничение на цену (опционально, с допуском)
-        max_price = tgt['price'] * (1 + tol['price'] / 100)
-        prob += lpSum([self.dishes[i].price * x[i] for i in range(self.n_dishes)]) <= max_price, "MaxPrice"
+        PULP_CBC_CMD запускает CBC отдельным процессом и не даёт callback на
+        новые допустимые решения, поэтому CBC запускается несколько раз на одной
+        модели с удваивающимся лимитом времени (first_time_limit, 2x, 4x, ...),
+        каждый раз стартуя с предыдущего решения (warm start). Поиск
+        заканчивается, когда CBC доказал оптимальность или истекло max_time
+        (по умолчанию - self.time_limit, None - без ограничения).
 
-        # Решаем задачу
-        prob.solve()
+        В каждом плане дополнительно есть "objective" - значение целевой функции.
+        """
+        if not PULP_AVAILABLE:
+            yield {"status": "error", "message": "PuLP не установлен"}
+            return
+
+        if not self.dishes:
+            yield {"status": "error", "message": "Список блюд пуст"}
+            return
+
+        self._prepare_model(target, tolerance, structure)
+        if max_time is None:
+            max_time = self.time_limit
+
+        saved_limit = self.time_limit
+        started = time.perf_counter()
+        limit = first_time_limit
+        best = float('inf')
+        try:
+            while True:
+                left = None if max_time is None else max_time - (time.perf_counter() - started)
+                if left is not None and left <= 0:
+                    return
+                self.time_limit = limit if left is None else min(limit, left)
+
+                result = self._solve_current(target, tolerance, structure)
+                if result.get("cancelled"):
+                    yield result
+                    return
+
+                status = self._prob.status
+                if status == LpStatusNotSolved and self.time_limit is not None:
+                    # За отведённое время CBC не нашёл ни одного решения - даём больше
+                    limit *= 2
+                    continue
+                if status != LpStatusOptimal:
+                    if best == float('inf'):
+                        yield {
+                            "status": "error",
+                            "message": f"Не удалось найти оптимальное решение. Статус: {LpStatus[status]}",
+                            "method": "PuLP"
+                        }
+                    return
+
+                objective = value(self._prob.objective) or 0.0
+                if objective < best - 1e-9:
+                    best = objective
+                    result["objective"] = round(objective, 4)
+                    yield result
+
+                if self._prob.sol_status == LpSolutionOptimal:
+                    return
+                limit *= 2
+        finally:
+            self.time_limit = saved_limit
+
+    def solve_pareto(self, target: DietTarget, tolerance: DietTolerance,
+                     structure: MealStructure, points: int = 10) -> Dict[str, Any]:
+        """
+        Строит Парето-фронт «цена / отклонение от цели» на одной модели.
+
+        Метод epsilon-ограничений: находятся самый точный и самый дешёвый
+        планы, затем ограничение MaxPrice проходит points значений между их
+        ценами и на каждом шаге минимизируется отклонение. Все решения идут
+        на уже построенной модели с warm start от предыдущего шага.
+
+        Returns:
+            {"status", "method", "front": [{"price", "deviation", "result"}, ...]}
+            Точки фронта отсортированы по возрастанию цены.
+        """
+        if not PULP_AVAILABLE:
+            return {"status": "error", "message": "PuLP не установлен"}
+
+        if not self.dishes:
+            return {"status": "error", "message": "Список блюд пуст"}
+
+        self._prepare_model(target, tolerance, structure)
+        max_price = self._prob.constraints["MaxPrice"]
+        # Малый вес цены: среди равных по точности выбирается более дешёвый
+        tie_break = 1e-6
+
+        try:
+            # Самый точный план (цена - только при равенстве отклонений)
+            self._set_objective(tie_break)
+            closest = self._solve_current(target, tolerance, structure)
+            if closest["status"] != "success":
+                return closest
+            high = value(self._price_expr)
+
+            # Самый дешёвый план
+            self._prob.setObjective(self._price_expr + tie_break * self._deviation_expr)
+            cheapest = self._solve_current(target, tolerance, structure)
+            low = value(self._price_expr) if cheapest["status"] == "success" else high
+
+            self._set_objective(tie_break)
+            front = []
+            for k in range(points):
+                cap = low + (high - low) * k / max(points - 1, 1)
+                max_price.changeRHS(cap)
+                result = self._solve_current(target, tolerance, structure)
+                if result["status"] == "success":
+                    front.append({
+                        "price": round(value(self._price_expr), 2),
+                        "deviation": round(value(self._deviation_expr), 2),
+                        "result": result
+                    })
+        finally:
+            self._set_objective(self.PRICE_WEIGHT)
+
+        # Оставляем только недоминируемые точки
+        pareto = []
+        for point in sorted(front, key=lambda p: (p["price"], p["deviation"])):
+            if not pareto or point["deviation"] < pareto[-1]["deviation"]:
+                pareto.append(point)
+
+        return {"status": "success", "method": "PuLP", "front": pareto}
+
+    def _prepare_model(self, target: DietTarget, tolerance: DietTolerance,
+                       structure: MealStructure) -> None:
+        """Строит модель при необходимости и выставляет правые части"""
+        # Число приёмов пищи входит в саму модель только при assign_meals
+        if self._prob is None or (self.assign_meals and structure.num_meals != self._model_meals):
+            self._build_model(structure.num_meals)
+        self._update_rhs(target, tolerance, structure)
+        if self.preprocess:
+            self._apply_pruning(target, tolerance, structure)
+
+    def _apply_pruning(self, target: DietTarget, tolerance: DietTolerance,
+                       structure: MealStructure) -> None:
+        """
+        Фиксирует в нуле переменные блюд, отброшенных предобработкой.
+
+        Модель не перестраивается: меняются только верхние границы x_i,
+        так что она по-прежнему общая для разных целей и структур.
+        """
+        max_price = target.price * (1 + tolerance.price / 100)
+        kept, self.preprocess_report = prune_dishes(self.dishes, structure, max_price=max_price)
+        allowed = set(kept)
+        for i, var in enumerate(self._x):
+            var.upBound = 1 if i in allowed else 0
+
+    def _solve_current(self, target: DietTarget, tolerance: DietTolerance,
+                       structure: MealStructure) -> Dict[str, Any]:
+        """Запускает CBC на текущей модели и форматирует решение"""
+        prob = self._prob
+        x = self._x
+
+        if self.stop_event is not None and self.stop_event.is_set():
+            if self._metrics is not None:
+                self._metrics.exit_reason = "cancelled"
+            return {"status": "error", "message": "Расчёт отменён", "method": "PuLP", "cancelled": True}
+
+        # Решаем задачу (значения переменных с прошлого решения - стартовые)
+        self._report("cbc", 0, 1, float('inf'))
+        with self._phase("cbc"):
+            self._run_cbc(prob)
+        self._report("cbc", 1, 1, value(prob.objective) or 0.0)
 
         # Проверяем статус решения
         if LpStatusOptimal != 1 and prob.status != LpStatusOptimal:
+            self._has_solution = False
             return {
                 "status": "error",
                 "message": f"Не удалось найти оптимальное решение. Статус: {LpStatus[prob.status]}",
                 "method": "PuLP"
             }
+        self._has_solution = prob.status == LpStatusOptimal
+
+        with self._phase("format"):
+            return self._extract_result(target, tolerance, structure)
+
+    def _run_cbc(self, prob: 'LpProblem') -> None:
+        """
+        Запускает CBC. При сборе метрик лог CBC пишется во временный файл,
+        из него берутся число узлов, итераций и итог (причина остановки).
+        """
+        log_path = None
+        if self._metrics is not None:
+            fd, log_path = tempfile.mkstemp(prefix="cbc_", suffix=".log")
+            os.close(fd)
+        try:
+            prob.solve(PULP_CBC_CMD(msg=False, warmStart=self._has_solution,
+                                    timeLimit=self.time_limit, logPath=log_path))
+            if log_path is not None:
+                with open(log_path, encoding="utf-8", errors="replace") as f:
+                    stats = parse_cbc_log(f.read())
+                for key in ("cbc_nodes", "cbc_iterations"):
+                    if key in stats:
+                        self._count(key, stats[key])
+                self._metrics.exit_reason = stats.get("cbc_result", LpStatus[prob.status])
+        finally:
+            if log_path is not None:
+                os.remove(log_path)
+
+    def _extract_result(self, target: DietTarget, tolerance: DietTolerance,
+                        structure: MealStructure) -> Dict[str, Any]:
+        """Собирает план из значений переменных решённой модели"""
+        x = self._x
 
         # Извлекаем решение
         selected_dishes = []
@@ -110,7 +487,14 @@ class PulpDietSolver:
                 selected_dishes.append(self.dishes[i])
 
         # Формируем план питания (распределяем по приёмам пищи)
-        meals_plan = self._distribute_meals(selected_dishes, structure.num_meals)
+        if self.assign_meals:
+            meals_plan = [
+                [self.dishes[i] for i in range(self.n_dishes) if value(self._y[i][m]) > 0.5]
+                for m in range(structure.num_meals)
+            ]
+            meals_plan = [m for m in meals_plan if m] or [[]]
+        else:
+            meals_plan = self._distribute_meals(selected_dishes, structure.num_meals)
 
         # Считаем итоги
         totals = {
@@ -124,6 +508,72 @@ class PulpDietSolver:
 
         return self._format_result(meals_plan, totals, target, tolerance, "PuLP")
 
+    def solve_week(self, target: DietTarget, tolerance: DietTolerance,
+                   structure: MealStructure, days: int = 7,
+                   max_repeats_per_dish: int = 2,
+                   weekly_budget: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Подбор рациона на несколько дней одной моделью.
+
+        Переменные x_id = 1 если блюдо i выбрано в день d. Для каждого дня
+        свои отклонения БЖУ и ограничения на число блюд; общими являются
+        лимит повторов блюда за период и бюджет на весь период.
+        """
+        if not PULP_AVAILABLE:
+            return {"status": "error", "message": "PuLP не установлен"}
+
+        if not self.dishes:
+            return {"status": "error", "message": "Список блюд пуст"}
+
+        tgt = target.to_dict()
+        coef = self._coefficients()
+        dish_range = range(self.n_dishes)
+        day_range = range(days)
+        prob = LpProblem("Optimal_Diet_Week", LpMinimize)
+
+        x = [[LpVariable(f"dish_{i}_day_{d}", cat=LpBinary) for d in day_range]
+             for i in dish_range]
+
+        deviations = []
+        for d in day_range:
+            for key, name in self.NUTRIENT_CONSTRAINTS:
+                dev_pos = LpVariable(f"dev_{key}_{d}_pos", lowBound=0)
+                dev_neg = LpVariable(f"dev_{key}_{d}_neg", lowBound=0)
+                deviations += [dev_pos, dev_neg]
+                expr = lpSum([coef[key][i] * x[i][d] for i in dish_range])
+                prob += expr - dev_pos + dev_neg == tgt[key], f"{name}_{d}"
+
+            total_dishes = lpSum([x[i][d] for i in dish_range])
+            prob += total_dishes >= structure.min_dishes_per_meal * structure.num_meals, f"MinDishes_{d}"
+            prob += total_dishes <= structure.max_dishes_per_meal * structure.num_meals, f"MaxDishes_{d}"
+
+        # Разнообразие: блюдо встречается не более чем в max_repeats_per_dish днях
+        for i in dish_range:
+            prob += lpSum(x[i]) <= max_repeats_per_dish, f"Repeats_{i}"
+
+        price_expr = lpSum([coef['price'][i] * x[i][d] for i in dish_range for d in day_range])
+        prob += price_expr <= week_budget(target, tolerance, days, weekly_budget), "WeekBudget"
+        prob += lpSum(deviations) + price_expr * self.PRICE_WEIGHT, "Objective"
+
+        prob.solve(PULP_CBC_CMD(msg=False, timeLimit=self.time_limit))
+
+        if prob.status != LpStatusOptimal:
+            return {
+                "status": "error",
+                "message": f"Не удалось найти оптимальное решение. Статус: {LpStatus[prob.status]}",
+                "method": "PuLP"
+            }
+
+        day_results = []
+        for d in day_range:
+            selected = [self.dishes[i] for i in dish_range if value(x[i][d]) > 0.5]
+            totals = {key: sum(getattr(dish, key) for dish in selected)
+                      for key in ('calories', 'proteins', 'fats', 'carbs', 'price', 'weight')}
+            meals_plan = self._distribute_meals(selected, structure.num_meals)
+            day_results.append(self._format_result(meals_plan, totals, target, tolerance, "PuLP"))
+
+        return format_week(day_results, "PuLP")
+
     def _distribute_meals(self, dishes: List[Dish], num_meals: int) -> List[List[Dish]]:
         """Распределяет блюда по приёмам пищи"""
         if num_meals <= 0:
@@ -0,0 +1,384 @@
+"""Векторизованные (NumPy) операции над таблицей вариантов приёмов пищи"""
+from math import comb
+from typing import List, Dict, Iterator, Tuple
+from models.dish import Dish, Meal
+from models.catalog import DishCatalog
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Порядок столбцов в матрице показателей (совпадает с порядком ключей totals)
+NUTRIENT_KEYS = ('calories', 'price', 'proteins', 'fats', 'carbs', 'weight')
+SCORE_KEYS = ('calories', 'proteins', 'fats', 'carbs')
+# Показатели, по которым считается штраф за день
+DEVIATION_KEYS = ('calories', 'proteins', 'fats', 'carbs', 'price')
+
+# Сколько строк комбинаций меньшего размера можно держать в памяти целиком
+_MATERIALIZE_LIMIT = 2_000_000
+# Сколько строк (состояние x вариант) обрабатывать за раз в dp_best_day
+_DP_CHUNK = 1 << 20
+# Разрядность одной координаты ячейки сетки в ключе int64
+_KEY_BITS = 15
+
+
+def dishes_to_matrix(dishes: List[Dish]) -> 'np.ndarray':
+    """Переводит список блюд или DishCatalog в матрицу показателей (n_dishes x len(NUTRIENT_KEYS))"""
+    if isinstance(dishes, DishCatalog):
+        return dishes.to_matrix(NUTRIENT_KEYS)
+    return np.array(
+        [[getattr(d, key) for key in NUTRIENT_KEYS] for d in dishes],
+        dtype=np.float64
+    ).reshape(len(dishes), len(NUTRIENT_KEYS))
+
+
+def _combination_blocks(matrix: 'np.ndarray', r: int,
+                        n: int) -> Iterator[Tuple['np.ndarray', 'np.ndarray']]:
+    """
+    Перебирает сочетания по r из первых n блюд блоками (индексы, суммы).
+
+    Блоки идут в колексикографическом порядке: блок k содержит все сочетания,
+    максимальный индекс которых равен k. Поэтому первые C(k, r-1) строк
+    сочетаний меньшего размера - ровно те, что можно дополнить блюдом k.
+    """
+    if r == 1:
+        yield np.arange(n, dtype=np.int32)[:, None], matrix[:n]
+        return
+
+    if comb(n - 1, r - 1) <= _MATERIALIZE_LIMIT:
+        blocks = list(_combination_blocks(matrix, r - 1, n - 1))
+        if not blocks:
+            return
+        prev_idx = np.concatenate([b[0] for b in blocks])
+        prev_tot = np.concatenate([b[1] for b in blocks])
+        for k in range(r - 1, n):
+            m = comb(k, r - 1)
+            idx = np.empty((m, r), dtype=np.int32)
+            idx[:, :-1] = prev_idx[:m]
+            idx[:, -1] = k
+            yield idx, prev_tot[:m] + matrix[k]
+    else:
+        for k in range(r - 1, n):
+            for prev_idx, prev_tot in _combination_blocks(matrix, r - 1, k):
+                idx = np.empty((len(prev_idx), r), dtype=np.int32)
+                idx[:, :-1] = prev_idx
+                idx[:, -1] = k
+                yield idx, prev_tot + matrix[k]
+
+
+def bucket_keys(totals: 'np.ndarray', steps: 'np.ndarray') -> 'np.ndarray':
+    """
+    Номер ячейки сетки по калориям и БЖУ (шаг steps по каждому из SCORE_KEYS),
+    упакованный в одно int64 - по _KEY_BITS разрядов на координату.
+    """
+    return _grid_keys(totals[:, [NUTRIENT_KEYS.index(key) for key in SCORE_KEYS]], steps)
+
+
+def _grid_keys(values: 'np.ndarray', steps: 'np.ndarray') -> 'np.ndarray':
+    """bucket_keys() для уже выбранных столбцов SCORE_KEYS"""
+    cells = np.clip(np.floor(values / steps), 0, (1 << _KEY_BITS) - 1).astype(np.int64)
+    keys = np.zeros(len(values), dtype=np.int64)
+    for c in range(cells.shape[1]):
+        keys = (keys << _KEY_BITS) | cells[:, c]
+    return keys
+
+
+def _first_per_key(keys: 'np.ndarray', *order_by: 'np.ndarray') -> 'np.ndarray':
+    """Индексы лучшей строки для каждого ключа (по order_by, при равенстве - первой)"""
+    order = np.lexsort(tuple(reversed(order_by)) + (keys,))
+    sorted_keys = keys[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    return order[first]
+
+
+def meal_scores(totals: 'np.ndarray', ideal_per_meal: Dict[str, float]) -> 'np.ndarray':
+    """Векторный аналог HeuristicDietSolver._meal_score"""
+    scores = np.zeros(len(totals), dtype=np.float64)
+    for key in SCORE_KEYS:
+        ideal = ideal_per_meal.get(key, 0)
+        if ideal > 0:
+            col = NUTRIENT_KEYS.index(key)
+            scores += np.abs(totals[:, col] - ideal) / ideal
+    return scores
+
+
+class MealTable:
+    """
+    Таблица лучших вариантов одного приёма пищи.
+
+    indices - индексы блюд (K x max_dishes, -1 для пустых позиций)
+    totals  - суммарные показатели в порядке NUTRIENT_KEYS (K x 6)
+    scores  - оценка близости к идеалу (меньше - лучше)
+    """
+
+    def __init__(self, indices: 'np.ndarray', totals: 'np.ndarray', scores: 'np.ndarray'):
+        self.indices = indices
+        self.totals = totals
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @classmethod
+    def build(cls, matrix: 'np.ndarray', min_dishes: int, max_dishes: int,
+              ideal_per_meal: Dict[str, float], limit: int) -> 'MealTable':
+        """
+        Перебирает все сочетания блюд батчами и оставляет limit лучших.
+        Промежуточные Meal и словари не создаются.
+        """
+        n = len(matrix)
+        width = max(max_dishes, 1)
+        buf_idx, buf_tot, buf_scores, buf_order = [], [], [], []
+        buffered = 0
+        offset = 0
+
+        def shrink():
+            idx = np.concatenate(buf_idx)
+            tot = np.concatenate(buf_tot)
+            scores = np.concatenate(buf_scores)
+            order = np.concatenate(buf_order)
+            if len(scores) > limit:
+                keep = np.argpartition(scores, limit - 1)[:limit]
+                idx, tot, scores, order = idx[keep], tot[keep], scores[keep], order[keep]
+            buf_idx[:], buf_tot[:], buf_scores[:], buf_order[:] = [idx], [tot], [scores], [order]
+            return len(scores)
+
+        for r in range(max(min_dishes, 1), min(max_dishes, n) + 1):
+            for idx, tot in _combination_blocks(matrix, r, n):
+                scores = meal_scores(tot, ideal_per_meal)
+                order = np.arange(offset, offset + len(scores), dtype=np.int64)
+                offset += len(scores)
+                if len(scores) > limit:
+                    keep = np.argpartition(scores, limit - 1)[:limit]
+                    idx, tot, scores, order = idx[keep], tot[keep], scores[keep], order[keep]
+
+                padded = np.full((len(idx), width), -1, dtype=np.int32)
+                padded[:, :r] = idx
+                buf_idx.append(padded)
+                buf_tot.append(tot)
+                buf_scores.append(scores)
+                buf_order.append(order)
+                buffered += len(scores)
+
+                if buffered > 4 * limit:
+                    buffered = shrink()
+
+        if not buf_scores:
+            return cls(np.empty((0, width), dtype=np.int32),
+                       np.empty((0, len(NUTRIENT_KEYS))),
+                       np.empty(0))
+
+        shrink()
+        idx, tot, scores, order = buf_idx[0], buf_tot[0], buf_scores[0], buf_order[0]
+        # Стабильная сортировка: при равной оценке - в порядке генерации
+        ranking = np.lexsort((order, scores))
+        return cls(idx[ranking], tot[ranking], scores[ranking])
+
+    @classmethod
+    def build_buckets(cls, matrix: 'np.ndarray', min_dishes: int, max_dishes: int,
+                      ideal_per_meal: Dict[str, float], steps: 'np.ndarray') -> 'MealTable':
+        """
+        Перебирает все сочетания блюд батчами и оставляет по самому дешёвому
+        варианту в каждой ячейке сетки калорий/БЖУ (см. bucket_keys).
+
+        В отличие от build() размер таблицы определяется шагом сетки, а не
+        лимитом: варианты, отличающиеся меньше чем на шаг, схлопываются, а
+        непохожие на идеал не отбрасываются. Таблица упорядочена по оценке.
+        """
+        n = len(matrix)
+        width = max(max_dishes, 1)
+        price_col = NUTRIENT_KEYS.index('price')
+        buf_keys, buf_idx, buf_tot = [], [], []
+        buffered = kept = 0
+
+        def shrink():
+            keys = np.concatenate(buf_keys)
+            idx = np.concatenate(buf_idx)
+            tot = np.concatenate(buf_tot)
+            first = _first_per_key(keys, tot[:, price_col])
+            buf_keys[:], buf_idx[:], buf_tot[:] = [keys[first]], [idx[first]], [tot[first]]
+            return len(first)
+
+        for r in range(max(min_dishes, 1), min(max_dishes, n) + 1):
+            for idx, tot in _combination_blocks(matrix, r, n):
+                keys = bucket_keys(tot, steps)
+                first = _first_per_key(keys, tot[:, price_col])
+                padded = np.full((len(first), width), -1, dtype=np.int32)
+                padded[:, :r] = idx[first]
+                buf_keys.append(keys[first])
+                buf_idx.append(padded)
+                buf_tot.append(tot[first])
+                buffered += len(first)
+
+                if buffered > max(4 * kept, _DP_CHUNK):
+                    buffered = kept = shrink()
+
+        if not buf_keys:
+            return cls(np.empty((0, width), dtype=np.int32),
+                       np.empty((0, len(NUTRIENT_KEYS))),
+                       np.empty(0))
+
+        shrink()
+        idx, tot = buf_idx[0], buf_tot[0]
+        scores = meal_scores(tot, ideal_per_meal)
+        ranking = np.lexsort((tot[:, price_col], scores))
+        return cls(idx[ranking], tot[ranking], scores[ranking])
+
+    def to_meals(self, dishes: List[Dish]) -> List[Meal]:
+        """Создаёт объекты Meal только для оставшихся вариантов"""
+        meals = []
+        for row, totals in zip(self.indices.tolist(), self.totals.tolist()):
+            meals.append(Meal(
+                dishes=[dishes[i] for i in row if i >= 0],
+                totals=dict(zip(NUTRIENT_KEYS, totals))
+            ))
+        return meals
+
+
+class DeviationBounds:
+    """Границы допуска по показателям дня в виде массивов"""
+
+    def __init__(self, target: Dict[str, float], tolerance: Dict[str, float]):
+        self.columns = np.array([NUTRIENT_KEYS.index(k) for k in DEVIATION_KEYS])
+        self.target = np.array([target[k] for k in DEVIATION_KEYS], dtype=np.float64)
+        tol = np.array([tolerance[k] for k in DEVIATION_KEYS], dtype=np.float64)
+        self.lower = self.target * (1 - tol / 100)
+        self.upper = self.target * (1 + tol / 100)
+        self.zero_target = self.target == 0
+        self.scale = np.where(self.zero_target, 1.0, self.target)
+
+    def scores(self, day_totals: 'np.ndarray') -> 'np.ndarray':
+        """Векторный аналог суммы HeuristicDietSolver._get_deviation_score"""
+        return self.penalty(day_totals[..., self.columns])
+
+    def penalty(self, actual: 'np.ndarray') -> 'np.ndarray':
+        """То же, что scores(), для уже выбранных столбцов DEVIATION_KEYS"""
+        below = np.maximum(self.lower - actual, 0)
+        above = np.maximum(actual - self.upper, 0)
+        penalty = (below + above) / self.scale * 100
+        penalty = np.where(self.zero_target, np.where(actual == 0, 0.0, 100.0), penalty)
+        return penalty.sum(axis=-1)
+
+
+def sample_best_day(meal_totals: 'np.ndarray', num_meals: int, bounds: DeviationBounds,
+                    iterations: int, batch_size: int, rng: 'np.random.Generator',
+                    stop_event=None, progress=None) -> Tuple[float, 'np.ndarray', 'np.ndarray']:
+    """
+    Монте-Карло сборка дня батчами: за раз разыгрывается batch_size дней
+    в виде массива индексов, их суммы и штрафы считаются матрично.
+    Останавливается на первом батче, где найден день с нулевым штрафом,
+    или когда установлен stop_event (threading/multiprocessing Event).
+    После каждого батча вызывается progress(число итераций, лучший штраф).
+
+    Returns: (штраф, индексы приёмов пищи, суммарные показатели дня)
+    """
+    best_score = float('inf')
+    best_idx = None
+    best_totals = None
+    remaining = iterations
+
+    while remaining > 0:
+        if stop_event is not None and stop_event.is_set():
+            break
+        size = min(batch_size, remaining)
+        remaining -= size
+
+        idx = rng.integers(0, len(meal_totals), size=(size, num_meals))
+        day_totals = meal_totals[idx].sum(axis=1)
+        scores = bounds.scores(day_totals)
+
+        i = int(np.argmin(scores))
+        if scores[i] < best_score:
+            best_score = float(scores[i])
+            best_idx = idx[i]
+            best_totals = day_totals[i]
+
+            if best_score == 0:
+                break
+
+        if progress is not None:
+            progress(iterations - remaining, best_score)
+
+    return best_score, best_idx, best_totals
+
+
+def dp_best_day(meal_totals: 'np.ndarray', num_meals: int, bounds: DeviationBounds,
+                steps: 'np.ndarray', width: int, stop_event=None,
+                progress=None) -> Tuple[float, 'np.ndarray', 'np.ndarray']:
+    """
+    Сборка дня динамическим программированием по ячейкам сетки.
+
+    Состояние после k приёмов пищи - суммы показателей; состояния, попавшие
+    в одну ячейку сетки, сливаются, остаётся лучшее. Лучшим считается
+    состояние с меньшим штрафом его суммы, пересчитанной на полный день
+    (* num_meals / k), при равенстве - более дешёвое. В слое остаётся не
+    более width состояний, поэтому время и качество зависят от width и шага
+    сетки, а не от случая. Варианты в дне не убывают по номеру -
+    перестановки одного дня не перебираются.
+
+    После stop_event оставшиеся слои достраиваются с width = 1.
+
+    Returns: (штраф, индексы приёмов пищи, суммарные показатели дня)
+    """
+    n = len(meal_totals)
+    if n == 0 or num_meals < 1:
+        return float('inf'), None, None
+
+    # Состояния хранят только показатели штрафа (DEVIATION_KEYS), первые
+    # четыре из них - SCORE_KEYS, по которым строится сетка
+    meals = np.ascontiguousarray(meal_totals[:, bounds.columns])
+    n_keys = len(SCORE_KEYS)
+    price_col = DEVIATION_KEYS.index('price')
+    states = np.zeros((1, meals.shape[1]))
+    paths = np.zeros((1, 0), dtype=np.int64)
+    chunk = max(1, _DP_CHUNK // n)
+
+    def best_states(tot, rank, limit):
+        # Цена - только для равных штрафов, её вклад меньше погрешности штрафа
+        order_key = rank + tot[:, price_col] * 1e-9
+        # Сначала дешёвый отбор лучших кандидатов, уникальность ячеек -
+        # только среди них; если различных ячеек не хватило, отбор шире
+        pool = 4 * limit
+        while True:
+            if pool < len(order_key):
+                top = np.argpartition(order_key, pool - 1)[:pool]
+            else:
+                top = np.arange(len(order_key))
+            keep = top[_first_per_key(_grid_keys(tot[top, :n_keys], steps), order_key[top])]
+            if len(keep) >= limit or len(top) == len(order_key):
+                break
+            pool *= 4
+        if len(keep) > limit:
+            keep = keep[np.argsort(order_key[keep], kind='stable')[:limit]]
+        return keep
+
+    for layer in range(1, num_meals + 1):
+        if stop_event is not None and stop_event.is_set():
+            width = 1
+        scale = num_meals / layer
+        parts = []
+        for start in range(0, len(states), chunk):
+            parent = np.repeat(np.arange(start, min(start + chunk, len(states))), n)
+            meal = np.tile(np.arange(n), len(parent) // n)
+            if layer > 1:
+                ordered = meal >= paths[parent, -1]
+                parent, meal = parent[ordered], meal[ordered]
+            tot = states[parent] + meals[meal]
+            keep = best_states(tot, bounds.penalty(tot * scale), width)
+            parts.append((tot[keep], parent[keep], meal[keep]))
+
+        tot, parent, meal = (np.concatenate(p) for p in zip(*parts))
+        rank = bounds.penalty(tot * scale)
+        keep = best_states(tot, rank, width)
+        states = tot[keep]
+        paths = np.column_stack([paths[parent[keep]], meal[keep]])
+        if progress is not None:
+            progress(layer, float(rank[keep].min()))
+
+    scores = bounds.penalty(states)
+    best = int(np.lexsort((states[:, price_col], scores))[0])
+    return float(scores[best]), paths[best], meal_totals[paths[best]].sum(axis=0)
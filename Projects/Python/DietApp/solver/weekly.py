@@ -0,0 +1,32 @@
+"""Общие функции для подбора рациона на несколько дней"""
+from typing import List, Dict, Any, Optional
+from models.dish import DietTarget, DietTolerance
+
+
+def week_budget(target: DietTarget, tolerance: DietTolerance, days: int,
+                weekly_budget: Optional[float] = None) -> float:
+    """Бюджет на весь период: явный или дневная цена с допуском x число дней"""
+    if weekly_budget is not None:
+        return weekly_budget
+    return target.price * (1 + tolerance.price / 100) * days
+
+
+def format_week(day_results: List[Dict[str, Any]], method: str) -> Dict[str, Any]:
+    """Собирает результаты отдельных дней в результат на период"""
+    days = []
+    for i, day in enumerate(day_results):
+        days.append({
+            "day_number": i + 1,
+            "daily_totals": day["daily_totals"],
+            "total_price": day["total_price"],
+            "total_weight": day["total_weight"],
+            "plan": day["plan"]
+        })
+
+    return {
+        "status": "success",
+        "method": method,
+        "days": days,
+        "total_price": round(sum(d["total_price"] for d in days), 2),
+        "total_weight": round(sum(d["total_weight"] for d in days), 2)
+    }
@@ -0,0 +1,38 @@
+"""Проверка, что набор замеров запускается и сравнивает отчёты"""
+import copy
+import unittest
+from benchmarks.run import run_suite, compare, synthetic_catalog
+from models.dish import DietTolerance, MealStructure
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_synthetic_catalog_reproducible(self):
+        self.assertEqual(synthetic_catalog(30, seed=3), synthetic_catalog(30, seed=3))
+        self.assertNotEqual(synthetic_catalog(30, seed=3), synthetic_catalog(30, seed=4))
+
+    def test_suite_and_compare(self):
+        report = run_suite(
+            sizes=(20,),
+            structures={"3x1-1": MealStructure(max_dishes_per_meal=1)},
+            tolerances={"default": DietTolerance()},
+            log=lambda *args: None
+        )
+        cases = report["results"]
+        self.assertTrue(cases)
+        for case in cases:
+            self.assertEqual(case["dishes"], 20)
+            if "skipped" not in case:
+                self.assertIn("phases", case)
+                self.assertEqual(case["status"], "success")
+
+        slower = copy.deepcopy(report)
+        for case in slower["results"]:
+            if "total" in case:
+                case["total"] = case["total"] * 2 + 1
+        self.assertEqual(compare(report, report), [])
+        self.assertTrue(compare(report, slower))
+
+
+if __name__ == '__main__':
+    unittest.main()
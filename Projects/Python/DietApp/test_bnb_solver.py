@@ -0,0 +1,86 @@
+"""Тесты для решателя методом ветвей и границ"""
+import itertools
+import unittest
+from data.loader import DataLoader
+from models.dish import DietTarget, DietTolerance, MealStructure
+from solver.bnb_solver import BranchAndBoundDietSolver, OBJECTIVE_KEYS
+from solver.factory import SolverFactory
+from solver.pulp_solver import PulpDietSolver, PULP_AVAILABLE
+from solver.vectorized import NUMPY_AVAILABLE
+from test_heuristic_solver import make_dishes
+
+
+def brute_force(dishes, target, tolerance, structure):
+    """Полный перебор сочетаний - эталон для маленьких наборов"""
+    tgt = target.to_dict()
+    cap = tgt['price'] * (1 + tolerance.price / 100)
+    best = float('inf')
+    for r in range(structure.min_dishes_per_meal * structure.num_meals,
+                   structure.max_dishes_per_meal * structure.num_meals + 1):
+        for combo in itertools.combinations(dishes, r):
+            price = sum(d.price for d in combo)
+            if price > cap + 1e-9:
+                continue
+            score = BranchAndBoundDietSolver.PRICE_WEIGHT * price + sum(
+                abs(tgt[key] - sum(getattr(d, key) for d in combo)) for key in OBJECTIVE_KEYS)
+            best = min(best, score)
+    return best
+
+
+class TestBranchAndBound(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        """Найденный план оптимален в обоих режимах обхода"""
+        dishes = make_dishes(14, seed=3)
+        cases = [
+            (DietTarget(), MealStructure(2, 1, 2)),
+            (DietTarget(calories=900, price=350), MealStructure(3, 1, 1)),
+            (DietTarget(calories=1500, proteins=60), MealStructure(2, 0, 3)),
+        ]
+        for target, structure in cases:
+            expected = brute_force(dishes, target, DietTolerance(), structure)
+            for vectorized in (False, True):
+                result = BranchAndBoundDietSolver(dishes, vectorized=vectorized).solve(
+                    target, DietTolerance(), structure)
+                self.assertEqual(result['status'], 'success')
+                self.assertTrue(result['optimal'])
+                self.assertAlmostEqual(result['objective'], expected, places=3)
+
+    def test_meal_structure(self):
+        """Число блюд в каждом приёме укладывается в структуру"""
+        structure = MealStructure(3, 1, 2)
+        result = BranchAndBoundDietSolver(make_dishes(30)).solve(
+            DietTarget(), DietTolerance(), structure)
+        self.assertEqual(len(result['plan']), 3)
+        for meal in result['plan']:
+            self.assertTrue(1 <= len(meal['dishes']) <= 2)
+
+    def test_infeasible_price(self):
+        result = BranchAndBoundDietSolver(make_dishes(10)).solve(
+            DietTarget(price=1), DietTolerance(), MealStructure())
+        self.assertEqual(result['status'], 'error')
+
+    @unittest.skipUnless(PULP_AVAILABLE, "PuLP не установлен")
+    def test_same_objective_as_pulp(self):
+        from pulp import value
+
+        dishes, _ = DataLoader.load_dishes_from_json(DataLoader.get_sample_json())
+        for structure in (MealStructure(), MealStructure(3, 1, 3)):
+            pulp_solver = PulpDietSolver(dishes)
+            pulp_solver.solve(DietTarget(), DietTolerance(), structure)
+            result = BranchAndBoundDietSolver(dishes).solve(DietTarget(), DietTolerance(), structure)
+            self.assertAlmostEqual(result['objective'], value(pulp_solver._prob.objective), places=3)
+
+    def test_factory(self):
+        dishes = make_dishes(10)
+        solver = SolverFactory.create(dishes, method="bnb")
+        self.assertIsInstance(solver, BranchAndBoundDietSolver)
+        if not PULP_AVAILABLE:
+            self.assertEqual(SolverFactory.resolve_method(dishes), "bnb")
+        self.assertEqual(SolverFactory.resolve_method(make_dishes(100), prefer_pulp=False), "heuristic")
+        with self.assertRaises(ValueError):
+            SolverFactory.create(dishes, method="simplex")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Тесты для кэша результатов"""
+import tempfile
+import unittest
+from dataclasses import replace
+from data.loader import DataLoader
+from models.dish import DietTarget, DietTolerance, MealStructure
+from solver.cache import SolverCache
+
+
+class CountingSolver:
+    """Решатель-заглушка, считающий вызовы"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def solve(self, target, tolerance, structure):
+        self.calls += 1
+        return {"status": "success", "method": "Test", "total_price": target.price}
+
+
+class TestSolverCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dishes, _ = DataLoader.load_dishes_from_json(DataLoader.get_sample_json())
+        self.params = (DietTarget(), DietTolerance(), MealStructure())
+
+    def test_repeated_request_hits_cache(self):
+        cache = SolverCache()
+        solver = CountingSolver()
+        first = cache.solve(self.dishes, *self.params, solver=solver)
+        second = cache.solve(self.dishes, *self.params, solver=solver)
+
+        self.assertEqual(first, second)
+        self.assertEqual(solver.calls, 1)
+        self.assertEqual(cache.hits, 1)
+
+    def test_changed_dishes_invalidate(self):
+        cache = SolverCache()
+        solver = CountingSolver()
+        cache.solve(self.dishes, *self.params, solver=solver)
+
+        changed = list(self.dishes)
+        changed[0] = replace(changed[0], price=changed[0].price + 1)
+        cache.solve(changed, *self.params, solver=solver)
+        self.assertEqual(solver.calls, 2)
+
+    def test_lru_eviction(self):
+        cache = SolverCache(max_entries=2)
+        solver = CountingSolver()
+        targets = [DietTarget(price=p) for p in (100, 200, 300)]
+        for target in targets:
+            cache.solve(self.dishes, target, DietTolerance(), MealStructure(), solver=solver)
+
+        cache.solve(self.dishes, targets[0], DietTolerance(), MealStructure(), solver=solver)
+        self.assertEqual(solver.calls, 4)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            solver = CountingSolver()
+            SolverCache(cache_dir=cache_dir).solve(self.dishes, *self.params, solver=solver)
+            result = SolverCache(cache_dir=cache_dir).solve(self.dishes, *self.params, solver=solver)
+
+            self.assertEqual(solver.calls, 1)
+            self.assertEqual(result["status"], "success")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Тесты для колоночного каталога блюд"""
+import unittest
+from models.dish import Dish, DietTarget, DietTolerance, MealStructure
+from models.catalog import DishCatalog
+from solver.bnb_solver import BranchAndBoundDietSolver
+from solver.diet_solver import HeuristicDietSolver
+from solver.pulp_solver import PULP_AVAILABLE, PulpDietSolver
+from solver.vectorized import NUMPY_AVAILABLE
+from test_heuristic_solver import make_dishes
+
+
+class TestDishCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.dishes = make_dishes(30)
+        self.dishes[0] = Dish(name="Борщ ☕", calories=250, proteins=8, fats=10,
+                              carbs=30, price=120, weight=300, recipe="Сварить")
+        self.catalog = DishCatalog.from_dishes(self.dishes)
+
+    def test_rows_match_dishes(self):
+        self.assertEqual(len(self.catalog), len(self.dishes))
+        self.assertEqual(self.catalog, self.dishes)
+        self.assertEqual(self.catalog[0].name, "Борщ ☕")
+        self.assertEqual(self.catalog[0].recipe, "Сварить")
+        self.assertEqual(self.catalog[-1].to_dish(), self.dishes[-1])
+        self.assertEqual(self.catalog.to_dishes(), self.dishes)
+        with self.assertRaises(IndexError):
+            self.catalog[len(self.dishes)]
+
+    def test_from_dicts(self):
+        catalog = DishCatalog.from_dishes(d.to_dict() for d in self.dishes)
+        self.assertEqual(catalog, self.catalog)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "NumPy не установлен")
+    def test_matrix_same_as_dishes(self):
+        from solver.vectorized import dishes_to_matrix
+        self.assertEqual(dishes_to_matrix(self.catalog).tolist(),
+                         dishes_to_matrix(self.dishes).tolist())
+
+    def test_solvers_accept_catalog(self):
+        """Точные решатели дают на каталоге тот же план, что на списке Dish"""
+        args = (DietTarget(), DietTolerance(), MealStructure())
+        solvers = [BranchAndBoundDietSolver]
+        if PULP_AVAILABLE:
+            solvers.append(PulpDietSolver)
+        for cls in solvers:
+            expected = cls(self.dishes).solve(*args)
+            actual = cls(self.catalog).solve(*args)
+            self.assertEqual(actual['status'], 'success')
+            self.assertEqual(actual['daily_totals'], expected['daily_totals'])
+
+        result = HeuristicDietSolver(self.catalog).solve(*args)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(len(result['plan']), 3)
+
+    def test_solve_week_with_catalog(self):
+        solver = HeuristicDietSolver(self.catalog)
+        result = solver.solve_week(DietTarget(), DietTolerance(), MealStructure(), days=2)
+        self.assertEqual(result['status'], 'success')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Тесты консольного пакетного расчёта"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from cli import main, parse_profile
+from data.loader import DataLoader
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.catalog = os.path.join(self.tmp.name, "dishes.json")
+        self.targets = os.path.join(self.tmp.name, "targets.jsonl")
+        self.output = os.path.join(self.tmp.name, "results.jsonl")
+        with open(self.catalog, "w", encoding="utf-8") as f:
+            f.write(DataLoader.get_sample_json())
+        with open(self.targets, "w", encoding="utf-8") as f:
+            f.write('{"id": "a", "target": {"calories": 1800, "proteins_pct": 30}}\n')
+            f.write('{"tolerance": {"price": 30}}\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_profile(self):
+        name, target, tolerance = parse_profile(
+            {"target": {"calories": 2000, "proteins_pct": 20}, "tolerance": {"fats": 5}}, 3)
+        self.assertEqual(name, 3)
+        self.assertAlmostEqual(target.proteins, 100)
+        self.assertEqual(tolerance.fats, 5)
+        with self.assertRaises(ValueError):
+            parse_profile({"target": {"kcal": 2000}}, 0)
+
+    def test_writes_jsonl(self):
+        code = main([self.catalog, self.targets, "-o", self.output, "--method", "heuristic"])
+        self.assertEqual(code, 0)
+        with open(self.output, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(sorted(line["index"] for line in lines), [0, 1])
+        self.assertEqual({line["id"] for line in lines}, {"a", 1})
+        self.assertTrue(all(line["result"]["status"] == "success" for line in lines))
+        self.assertNotIn("tkinter", sys.modules)
+
+    def test_bad_targets(self):
+        with open(self.targets, "w", encoding="utf-8") as f:
+            f.write('{"target": {"calories": ')
+        self.assertEqual(main([self.catalog, self.targets, "-o", self.output]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,228 @@
+"""Тесты для эвристического решателя"""
+import random
+import unittest
+from models.dish import Dish, DietTarget, DietTolerance, MealStructure
+from solver.diet_solver import HeuristicDietSolver
+from solver.vectorized import NUMPY_AVAILABLE
+
+
+def make_dishes(count: int, seed: int = 1):
+    """Генерирует случайный список блюд"""
+    rnd = random.Random(seed)
+    return [
+        Dish(
+            name=f"Блюдо {i}",
+            calories=rnd.uniform(20, 600),
+            proteins=rnd.uniform(0, 40),
+            fats=rnd.uniform(0, 40),
+            carbs=rnd.uniform(0, 80),
+            price=rnd.uniform(10, 300),
+            weight=rnd.uniform(50, 300)
+        )
+        for i in range(count)
+    ]
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy не установлен")
+class TestVectorizedMealTable(unittest.TestCase):
+    """Векторизованная генерация должна совпадать с поэлементной"""
+
+    def setUp(self):
+        self.dishes = make_dishes(40)
+        self.structure = MealStructure(num_meals=3, min_dishes_per_meal=1, max_dishes_per_meal=3)
+        self.ideal = {k: v / 3 for k, v in DietTarget().to_dict().items()}
+
+    def _python_meals(self, solver):
+        meals = solver._generate_possible_meals(self.structure)
+        meals.sort(key=lambda m: solver._meal_score(m, self.ideal))
+        return meals[:solver.MEAL_LIMIT]
+
+    def test_same_scores_as_python(self):
+        """Лучшие варианты и их оценки совпадают"""
+        from solver.vectorized import MealTable, dishes_to_matrix
+
+        solver = HeuristicDietSolver(self.dishes, vectorized=False)
+        expected = [solver._meal_score(m, self.ideal) for m in self._python_meals(solver)]
+
+        table = MealTable.build(dishes_to_matrix(self.dishes), 1, 3, self.ideal, solver.MEAL_LIMIT)
+        actual = [solver._meal_score(m, self.ideal) for m in table.to_meals(self.dishes)]
+
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            self.assertAlmostEqual(a, e, places=9)
+
+    def test_totals_match_dishes(self):
+        """Суммы в таблице совпадают с суммами по блюдам"""
+        from solver.vectorized import MealTable, dishes_to_matrix
+
+        solver = HeuristicDietSolver(self.dishes)
+        table = MealTable.build(dishes_to_matrix(self.dishes), 2, 2, self.ideal, 100)
+        for meal in table.to_meals(self.dishes):
+            self.assertEqual(len(meal.dishes), 2)
+            expected = solver._calculate_totals(meal.dishes)
+            for key, val in expected.items():
+                self.assertAlmostEqual(meal.totals[key], val, places=9)
+
+    def test_deviation_scores_match_python(self):
+        """Векторный штраф дня совпадает с _get_deviation_score"""
+        from solver.vectorized import DeviationBounds, NUTRIENT_KEYS, DEVIATION_KEYS, MealTable, dishes_to_matrix
+
+        solver = HeuristicDietSolver(self.dishes)
+        target = DietTarget(price=0).to_dict()
+        tolerance = DietTolerance(calories=2, proteins=5).to_dict()
+        table = MealTable.build(dishes_to_matrix(self.dishes), 1, 3, self.ideal, 200)
+        day_totals = table.totals * 3
+
+        scores = DeviationBounds(target, tolerance).scores(day_totals)
+        for row, score in zip(day_totals.tolist(), scores.tolist()):
+            totals = dict(zip(NUTRIENT_KEYS, row))
+            expected = sum(
+                solver._get_deviation_score(totals[k], target[k], tolerance[k])
+                for k in DEVIATION_KEYS
+            )
+            self.assertAlmostEqual(score, expected, places=9)
+
+    def test_buckets_keep_cheapest(self):
+        """В каждой ячейке сетки остаётся самый дешёвый вариант"""
+        from solver.vectorized import MealTable, bucket_keys, dishes_to_matrix, NUTRIENT_KEYS
+        import numpy as np
+
+        matrix = dishes_to_matrix(self.dishes)
+        steps = np.array([200.0, 10.0, 10.0, 20.0])
+        full = MealTable.build(matrix, 1, 2, self.ideal, 10 ** 6)
+        table = MealTable.build_buckets(matrix, 1, 2, self.ideal, steps)
+
+        price = NUTRIENT_KEYS.index('price')
+        cheapest = {}
+        for key, row in zip(bucket_keys(full.totals, steps).tolist(), full.totals.tolist()):
+            cheapest[key] = min(cheapest.get(key, float('inf')), row[price])
+        keys = bucket_keys(table.totals, steps).tolist()
+        self.assertEqual(sorted(keys), sorted(cheapest))
+        for key, row in zip(keys, table.totals.tolist()):
+            self.assertEqual(row[price], cheapest[key])
+
+    def test_dp_matches_brute_force(self):
+        """Без слияния ячеек и ограничения ширины DP находит точный минимум"""
+        from itertools import combinations_with_replacement
+        from solver.vectorized import DeviationBounds, dp_best_day
+        import numpy as np
+
+        totals = np.array([[d.calories, d.price, d.proteins, d.fats, d.carbs, d.weight]
+                           for d in self.dishes[:12]])
+        bounds = DeviationBounds(DietTarget(calories=900, price=300).to_dict(),
+                                 DietTolerance(calories=1, proteins=1).to_dict())
+        score, idx, day = dp_best_day(totals, 3, bounds, np.full(4, 0.1), 10 ** 6)
+
+        expected = min(bounds.scores(totals[list(c)].sum(axis=0)[None])[0]
+                       for c in combinations_with_replacement(range(12), 3))
+        self.assertAlmostEqual(score, expected, places=9)
+        self.assertEqual(day.tolist(), totals[idx].sum(axis=0).tolist())
+
+
+class TestHeuristicSolve(unittest.TestCase):
+    """Сквозные тесты решателя"""
+
+    def test_solve_returns_plan(self):
+        dishes = make_dishes(15)
+        for vectorized in (False, True):
+            solver = HeuristicDietSolver(dishes, vectorized=vectorized)
+            result = solver.solve(DietTarget(), DietTolerance(), MealStructure())
+            self.assertEqual(result['status'], 'success')
+            self.assertEqual(len(result['plan']), 3)
+
+    def test_refine_not_worse(self):
+        """Доводка отжигом не ухудшает результат Монте-Карло"""
+        from solver.local_search import anneal, deviation_bounds, day_penalty
+
+        meal_totals = [[rnd * 100, rnd * 30, rnd * 5, rnd * 3, rnd * 10, rnd * 50]
+                       for rnd in (random.Random(i).random() for i in range(300))]
+        bounds = deviation_bounds(DietTarget().to_dict(), DietTolerance().to_dict())
+        start = [0, 1, 2]
+        start_score = day_penalty([sum(meal_totals[i][k] for i in start) for k in range(6)], bounds)
+
+        score, day, totals = anneal(meal_totals, start, bounds, 0.2, random.Random(0))
+        self.assertLessEqual(score, start_score)
+        self.assertEqual(len(day), 3)
+        expected = [sum(meal_totals[i][k] for i in day) for k in range(6)]
+        self.assertAlmostEqual(day_penalty(expected, bounds), score, places=6)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "NumPy не установлен")
+    def test_solve_dp(self):
+        """Сборка DP детерминирована и не хуже Монте-Карло на трудной цели"""
+        target = DietTarget(calories=1500, proteins=150, fats=50, carbs=100, price=500)
+        results = [HeuristicDietSolver(make_dishes(25), assembly="dp").solve(
+            target, DietTolerance(), MealStructure()) for _ in range(2)]
+        self.assertEqual(results[0]['status'], 'success')
+        self.assertEqual(results[0]['daily_totals'], results[1]['daily_totals'])
+
+        solver = HeuristicDietSolver(make_dishes(25), assembly="dp")
+        solver.MEAL_LIMIT = 0  # В режиме DP лимит не используется
+        self.assertEqual(solver.solve(target, DietTolerance(), MealStructure())['status'], 'success')
+
+    def test_solve_with_refine(self):
+        solver = HeuristicDietSolver(make_dishes(20), refine_time=0.1)
+        result = solver.solve(DietTarget(), DietTolerance(), MealStructure())
+        self.assertEqual(result['status'], 'success')
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "NumPy не установлен")
+    def test_solve_parallel(self):
+        solver = HeuristicDietSolver(make_dishes(20), workers=2)
+        result = solver.solve(DietTarget(), DietTolerance(), MealStructure())
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(len(result['plan']), 3)
+
+    def test_solve_week_repeats(self):
+        """Блюдо не встречается больше чем в max_repeats_per_dish днях"""
+        solver = HeuristicDietSolver(make_dishes(40))
+        result = solver.solve_week(DietTarget(), DietTolerance(), MealStructure(),
+                                   days=3, max_repeats_per_dish=1)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(len(result['days']), 3)
+
+        seen = set()
+        for day in result['days']:
+            names = {d['name'] for meal in day['plan'] for d in meal['dishes']}
+            self.assertFalse(names & seen)
+            seen |= names
+
+    def test_progress_and_cancel(self):
+        """После отмены из progress_callback возвращается лучший найденный день"""
+        import threading
+
+        for vectorized in (False, True):
+            solver = HeuristicDietSolver(make_dishes(20), vectorized=vectorized)
+            solver.MAX_ITERATIONS = 10 ** 7
+            reports = []
+            solver.stop_event = threading.Event()
+
+            def on_progress(info):
+                reports.append(info)
+                if info['best_score'] < float('inf'):
+                    solver.stop_event.set()
+
+            solver.progress_callback = on_progress
+            # Недостижимая цель, чтобы поиск не остановился сам на нулевом штрафе
+            result = solver.solve(DietTarget(calories=100000), DietTolerance(), MealStructure())
+            self.assertTrue(reports)
+            self.assertEqual(reports[0]['phase'], 'search')
+            self.assertEqual(result['status'], 'success')
+            self.assertTrue(result['cancelled'])
+
+    def test_solve_iter_improves(self):
+        """solve_iter выдаёт планы с убывающим штрафом"""
+        for vectorized in (False, True):
+            solver = HeuristicDietSolver(make_dishes(20), vectorized=vectorized, refine_time=0.1)
+            results = list(solver.solve_iter(DietTarget(), DietTolerance(calories=1), MealStructure()))
+            self.assertTrue(results)
+            scores = [r['score'] for r in results]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            self.assertTrue(all(r['status'] == 'success' for r in results))
+
+    def test_empty_dishes(self):
+        solver = HeuristicDietSolver([])
+        result = solver.solve(DietTarget(), DietTolerance(), MealStructure())
+        self.assertEqual(result['status'], 'error')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Тесты для загрузки каталога блюд"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from data.loader import DataLoader, LoadReport
+from data.snapshot import snapshot_path
+
+
+class TestStreamingLoader(unittest.TestCase):
+
+    def _load(self, text: str, chunk_size: int = 7):
+        report = LoadReport()
+        stream = io.BytesIO(text.encode('utf-8'))
+        dishes = list(DataLoader.iter_dishes(stream, report, chunk_size=chunk_size))
+        return dishes, report
+
+    def test_same_as_json_loads(self):
+        """Маленькие блоки (с разрезанными UTF-8 символами) дают тот же результат"""
+        sample = DataLoader.get_sample_json()
+        expected, _ = DataLoader.load_dishes_from_json(sample)
+        for chunk_size in (1, 7, 4096):
+            dishes, report = self._load(sample, chunk_size)
+            self.assertEqual(dishes, expected)
+            self.assertEqual(report.loaded, len(expected))
+            self.assertEqual(report.error_count, 0)
+            self.assertIsNone(report.fatal)
+            self.assertEqual(report.bytes_read, len(sample.encode('utf-8')))
+
+    def test_collects_all_errors(self):
+        items = [
+            {"name": "A", "calories": 100},
+            {"name": "B"},
+            "не объект",
+            {"name": "C", "calories": "много"},
+            {"name": "D", "calories": 200},
+        ]
+        dishes, report = self._load(json.dumps(items, ensure_ascii=False))
+        self.assertEqual([d.name for d in dishes], ["A", "D"])
+        self.assertEqual(report.items, 5)
+        self.assertEqual(report.error_count, 3)
+        self.assertIn("элементе 1", report.errors[0])
+        self.assertIsNone(report.fatal)
+
+    def test_syntax_error_stops(self):
+        dishes, report = self._load('[{"name": "A", "calories": 1}, {"name": ]')
+        self.assertEqual(len(dishes), 1)
+        self.assertIsNotNone(report.fatal)
+
+    def test_not_a_list(self):
+        for text in ('{"name": "A"}', '', '[{"name": "A", "calories": 1}'):
+            _, report = self._load(text)
+            self.assertIsNotNone(report.fatal)
+
+    def test_empty_list(self):
+        dishes, report = self._load(' [ ] ')
+        self.assertEqual(dishes, [])
+        self.assertIsNone(report.fatal)
+
+
+class TestCatalogSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'dishes.json')
+        self._write(DataLoader.get_sample_json())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, text: str):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_reload_from_snapshot(self):
+        catalog, report = DataLoader.load_catalog_from_file(self.path)
+        self.assertFalse(report.snapshot)
+        self.assertTrue(os.path.exists(snapshot_path(self.path)))
+
+        cached, report = DataLoader.load_catalog_from_file(self.path)
+        self.assertTrue(report.snapshot)
+        self.assertEqual(report.loaded, len(catalog))
+        self.assertEqual(cached, catalog)
+        self.assertIsInstance(cached.column('calories'), memoryview)
+
+    def test_same_content_keeps_snapshot(self):
+        """Перезапись тем же содержимым (новый mtime) проверяется по хэшу"""
+        DataLoader.load_catalog_from_file(self.path)
+        os.utime(self.path, ns=(0, 0))
+        _, report = DataLoader.load_catalog_from_file(self.path)
+        self.assertTrue(report.snapshot)
+
+    def test_changed_source_rebuilds(self):
+        DataLoader.load_catalog_from_file(self.path)
+        self._write('[{"name": "Новое", "calories": 10}, {"name": "X"}]')
+        catalog, report = DataLoader.load_catalog_from_file(self.path)
+        self.assertFalse(report.snapshot)
+        self.assertEqual([d.name for d in catalog], ["Новое"])
+
+        _, report = DataLoader.load_catalog_from_file(self.path)
+        self.assertTrue(report.snapshot)
+        self.assertEqual((report.items, report.error_count), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
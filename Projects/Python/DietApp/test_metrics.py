@@ -0,0 +1,88 @@
+"""Тесты метрик расчёта"""
+import unittest
+from data.loader import DataLoader
+from models.dish import DietTarget, DietTolerance, MealStructure
+from solver.diet_solver import HeuristicDietSolver
+from solver.metrics import parse_cbc_log, set_metrics_hook
+from solver.pulp_solver import PulpDietSolver, PULP_AVAILABLE
+from test_heuristic_solver import make_dishes
+
+
+class TestHeuristicMetrics(unittest.TestCase):
+    """Метрики эвристики и передача в hook"""
+
+    def tearDown(self):
+        set_metrics_hook(None)
+
+    def test_instrumented_result(self):
+        for vectorized in (False, True):
+            solver = HeuristicDietSolver(make_dishes(15), vectorized=vectorized, instrument=True)
+            result = solver.solve(DietTarget(), DietTolerance(), MealStructure())
+            metrics = result['metrics']
+
+            self.assertEqual(metrics['method'], 'Heuristic')
+            for phase in ('generation', 'search', 'format'):
+                self.assertIn(phase, metrics['phases'])
+            counters = metrics['counters']
+            self.assertEqual(counters['dishes'], 15)
+            self.assertEqual(counters['candidate_meals'], len(solver.possible_meals))
+            self.assertGreater(counters['iterations'], 0)
+            self.assertIn(metrics['exit_reason'], ('zero_penalty', 'max_iterations'))
+
+    def test_hook_without_instrument(self):
+        received = []
+        solver = HeuristicDietSolver(make_dishes(10))
+        solver.metrics_hook = received.append
+        result = solver.solve(DietTarget(), DietTolerance(), MealStructure())
+
+        self.assertNotIn('metrics', result)
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]['counters']['dishes'], 10)
+
+    def test_failing_default_hook_ignored(self):
+        def hook(metrics):
+            raise RuntimeError("мониторинг недоступен")
+
+        set_metrics_hook(hook)
+        result = HeuristicDietSolver(make_dishes(10)).solve(
+            DietTarget(), DietTolerance(), MealStructure())
+        self.assertEqual(result['status'], 'success')
+
+    def test_disabled_by_default(self):
+        solver = HeuristicDietSolver(make_dishes(10))
+        result = solver.solve(DietTarget(), DietTolerance(), MealStructure())
+        self.assertNotIn('metrics', result)
+        self.assertIsNone(solver._metrics)
+
+
+class TestCbcLog(unittest.TestCase):
+
+    def test_parse(self):
+        log = ("Result - Optimal solution found\n\n"
+               "Objective value:                12.50000000\n"
+               "Enumerated nodes:               37\n"
+               "Total iterations:               512\n")
+        self.assertEqual(parse_cbc_log(log), {
+            'cbc_nodes': 37, 'cbc_iterations': 512, 'cbc_result': 'Optimal solution found'
+        })
+        self.assertEqual(parse_cbc_log(""), {})
+
+
+@unittest.skipUnless(PULP_AVAILABLE, "PuLP не установлен")
+class TestPulpMetrics(unittest.TestCase):
+
+    def test_instrumented_result(self):
+        dishes, _ = DataLoader.load_dishes_from_json(DataLoader.get_sample_json())
+        result = PulpDietSolver(dishes, instrument=True).solve(
+            DietTarget(), DietTolerance(), MealStructure())
+        metrics = result['metrics']
+
+        self.assertEqual(metrics['method'], 'PuLP')
+        self.assertEqual(list(metrics['phases']), ['model', 'cbc', 'format'])
+        self.assertIn('cbc_nodes', metrics['counters'])
+        self.assertEqual(metrics['counters']['dishes'], len(dishes))
+        self.assertTrue(metrics['exit_reason'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Тесты для предобработки каталога"""
+import unittest
+from dataclasses import replace
+from models.dish import Dish, DietTarget, DietTolerance, MealStructure
+from solver.diet_solver import HeuristicDietSolver
+from solver.preprocess import prune_dishes, meal_combinations
+from solver.pulp_solver import PULP_AVAILABLE, PulpDietSolver
+from test_heuristic_solver import make_dishes
+
+
+class TestPruneDishes(unittest.TestCase):
+
+    def setUp(self):
+        base = Dish(name="Каша", calories=300, proteins=10, fats=5, carbs=50, price=100)
+        self.dishes = [
+            base,
+            replace(base, name="Каша дороже", price=150),
+            replace(base, name="Каша копия"),
+            replace(base, name="Каша дешевле", price=80),
+            Dish(name="Икра", calories=300, proteins=25, fats=20, carbs=1, price=5000),
+        ]
+        self.structure = MealStructure(num_meals=1, min_dishes_per_meal=1, max_dishes_per_meal=2)
+
+    def test_keeps_cheapest_copies(self):
+        kept, report = prune_dishes(self.dishes, self.structure)
+        self.assertEqual(kept, [0, 3, 4])
+        self.assertEqual(report.duplicates, 2)
+        self.assertEqual(report.combinations_before, meal_combinations(5, self.structure))
+        self.assertEqual(report.combinations_after, 3 + 3)
+
+    def test_price_sensitive_removes_only_copies(self):
+        kept, report = prune_dishes(self.dishes, self.structure, max_copies=1, price_sensitive=True)
+        self.assertEqual(kept, [0, 1, 3, 4])
+        self.assertEqual(report.duplicates, 1)
+
+    def test_over_budget(self):
+        kept, report = prune_dishes(self.dishes, self.structure, max_price=1000)
+        self.assertNotIn(4, kept)
+        self.assertEqual(report.over_budget, 1)
+        self.assertIn("дороже бюджета 1", report.summary())
+
+
+class TestSolversWithPreprocess(unittest.TestCase):
+
+    def setUp(self):
+        # Каталог, где у каждого блюда есть несколько копий с той же ценой
+        self.dishes = [replace(d, name=f"{d.name} #{k}") for d in make_dishes(12) for k in range(4)]
+        self.args = (DietTarget(), DietTolerance(), MealStructure())
+
+    def test_heuristic_fewer_meals(self):
+        solver = HeuristicDietSolver(self.dishes, vectorized=False)
+        result = solver.solve(*self.args)
+        self.assertEqual(result['status'], 'success')
+        report = result['preprocess']
+        self.assertEqual(report['kept'], 12 * 2)
+        self.assertLess(report['combinations_after'], report['combinations_before'])
+
+    @unittest.skipUnless(PULP_AVAILABLE, "PuLP не установлен")
+    def test_pulp_same_answer(self):
+        plain = PulpDietSolver(self.dishes, preprocess=False).solve(*self.args)
+        solver = PulpDietSolver(self.dishes)
+        pruned = solver.solve(*self.args)
+        self.assertEqual(pruned['daily_totals'], plain['daily_totals'])
+        self.assertEqual(pruned['total_price'], plain['total_price'])
+        self.assertEqual(pruned['preprocess']['kept'], 12 * 4)
+
+        # Повторный расчёт на той же модели с другим бюджетом
+        solver.solve(DietTarget(price=150), DietTolerance(price=0), MealStructure())
+        self.assertGreater(solver.preprocess_report.over_budget, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
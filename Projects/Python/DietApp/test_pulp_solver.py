@@ -0,0 +1,110 @@
+"""Тесты для PuLP решателя"""
+import unittest
+from data.loader import DataLoader
+from models.dish import DietTarget, DietTolerance, MealStructure
+from solver.pulp_solver import PulpDietSolver, PULP_AVAILABLE
+
+
+@unittest.skipUnless(PULP_AVAILABLE, "PuLP не установлен")
+class TestPulpModelReuse(unittest.TestCase):
+    """Повторные решения на одной модели"""
+
+    def setUp(self):
+        self.dishes, _ = DataLoader.load_dishes_from_json(DataLoader.get_sample_json())
+
+    def _actual(self, result):
+        return {k: v['actual'] for k, v in result['daily_totals'].items()}
+
+    def test_model_built_once(self):
+        solver = PulpDietSolver(self.dishes)
+        solver.solve(DietTarget(), DietTolerance(), MealStructure())
+        prob = solver._prob
+        solver.solve(DietTarget(calories=1800), DietTolerance(), MealStructure())
+        self.assertIs(solver._prob, prob)
+
+    def test_resolve_matches_fresh_solver(self):
+        """Переиспользованная модель даёт тот же результат, что и новая"""
+        reused = PulpDietSolver(self.dishes)
+        reused.solve(DietTarget(), DietTolerance(), MealStructure())
+
+        for target, structure in (
+            (DietTarget(calories=1800, price=400), MealStructure()),
+            (DietTarget(calories=2500, proteins=150), MealStructure(4, 1, 3)),
+        ):
+            expected = PulpDietSolver(self.dishes).solve(target, DietTolerance(), structure)
+            actual = reused.solve(target, DietTolerance(), structure)
+            self.assertEqual(actual['status'], expected['status'])
+            self.assertEqual(self._actual(actual), self._actual(expected))
+
+    def test_solve_iter_improves(self):
+        """Каждый следующий план solve_iter лучше, последний совпадает с solve"""
+        results = list(PulpDietSolver(self.dishes).solve_iter(
+            DietTarget(), DietTolerance(), MealStructure()))
+        self.assertTrue(results)
+        objectives = [r['objective'] for r in results]
+        self.assertEqual(objectives, sorted(objectives, reverse=True))
+        self.assertEqual(len(set(objectives)), len(objectives))
+
+        expected = PulpDietSolver(self.dishes).solve(DietTarget(), DietTolerance(), MealStructure())
+        self.assertEqual(self._actual(results[-1]), self._actual(expected))
+
+    def test_pareto_front(self):
+        """Фронт: с ростом цены отклонение строго убывает"""
+        solver = PulpDietSolver(self.dishes)
+        result = solver.solve_pareto(DietTarget(), DietTolerance(), MealStructure(), points=6)
+        self.assertEqual(result['status'], 'success')
+
+        front = result['front']
+        self.assertGreaterEqual(len(front), 2)
+        for prev, cur in zip(front, front[1:]):
+            self.assertGreater(cur['price'], prev['price'])
+            self.assertLess(cur['deviation'], prev['deviation'])
+
+        # После фронта обычный solve работает как раньше
+        expected = PulpDietSolver(self.dishes).solve(DietTarget(), DietTolerance(), MealStructure())
+        actual = solver.solve(DietTarget(), DietTolerance(), MealStructure())
+        self.assertEqual(self._actual(actual), self._actual(expected))
+
+
+@unittest.skipUnless(PULP_AVAILABLE, "PuLP не установлен")
+class TestPulpMealAssignment(unittest.TestCase):
+    """Распределение блюд по приёмам пищи внутри модели"""
+
+    def test_meals_respect_structure(self):
+        dishes, _ = DataLoader.load_dishes_from_json(DataLoader.get_sample_json())
+        solver = PulpDietSolver(dishes, assign_meals=True, time_limit=10)
+        structure = MealStructure(num_meals=3, min_dishes_per_meal=1, max_dishes_per_meal=2)
+        result = solver.solve(DietTarget(), DietTolerance(), structure)
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(len(result['plan']), 3)
+        names = []
+        for meal in result['plan']:
+            self.assertGreaterEqual(len(meal['dishes']), 1)
+            self.assertLessEqual(len(meal['dishes']), 2)
+            names += [d['name'] for d in meal['dishes']]
+        self.assertEqual(len(names), len(set(names)))
+
+
+@unittest.skipUnless(PULP_AVAILABLE, "PuLP не установлен")
+class TestPulpWeek(unittest.TestCase):
+    """Подбор рациона на несколько дней"""
+
+    def test_week_repeats_and_budget(self):
+        dishes, _ = DataLoader.load_dishes_from_json(DataLoader.get_sample_json())
+        solver = PulpDietSolver(dishes, time_limit=10)
+        result = solver.solve_week(DietTarget(), DietTolerance(), MealStructure(),
+                                   days=2, max_repeats_per_dish=1, weekly_budget=1000)
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(len(result['days']), 2)
+        self.assertLessEqual(result['total_price'], 1000)
+        first, second = (
+            {d['name'] for meal in day['plan'] for d in meal['dishes']}
+            for day in result['days']
+        )
+        self.assertFalse(first & second)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Тесты HTTP-сервиса расчёта"""
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from data.loader import DataLoader
+from service.server import SolveService, LatencyStats
+
+
+async def request(port: int, method: str, path: str, payload=None):
+    """Один HTTP-запрос к сервису: (статус, JSON ответа)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+class TestSolveService(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_service(self, scenario, **options):
+        async def main():
+            service = SolveService(workers=1, data_dir=self.tmp.name, **options)
+            await service.start(port=0)
+            try:
+                await scenario(service)
+            finally:
+                await service.close()
+        asyncio.run(main())
+
+    def test_solve_and_metrics(self):
+        dishes = json.loads(DataLoader.get_sample_json())
+
+        async def scenario(service):
+            status, info = await request(service.port, "POST", "/catalogs",
+                                         {"name": "menu", "dishes": dishes})
+            self.assertEqual(status, 200)
+            self.assertEqual(info["dishes"], len(dishes))
+
+            for calories in (1800, 2000):
+                status, result = await request(service.port, "POST", "/solve", {
+                    "catalog": "menu", "method": "heuristic",
+                    "target": {"calories": calories}, "structure": {"num_meals": 3}
+                })
+                self.assertEqual(status, 200)
+                self.assertEqual(result["status"], "success")
+                self.assertIn("latency", result)
+
+            status, metrics = await request(service.port, "GET", "/metrics")
+            self.assertEqual(metrics["counters"]["solved"], 2)
+            self.assertEqual(metrics["latency"]["total"]["count"], 2)
+
+        self.run_service(scenario)
+
+    def test_errors_and_backpressure(self):
+        async def scenario(service):
+            status, _ = await request(service.port, "POST", "/solve", {"catalog": "nope"})
+            self.assertEqual(status, 404)
+            status, _ = await request(service.port, "GET", "/solve")
+            self.assertEqual(status, 405)
+
+            # Все места в очереди заняты - запрос отклоняется сразу
+            service._pending = service.workers + service.max_queue
+            status, payload = await request(service.port, "POST", "/solve", {"catalog": "nope"})
+            self.assertEqual(status, 503)
+            self.assertEqual(payload["status"], "error")
+            self.assertEqual(service.metrics()["counters"]["rejected"], 1)
+
+        self.run_service(scenario, max_queue=0)
+
+    def test_latency_percentiles(self):
+        stats = LatencyStats(window=100)
+        for i in range(1, 101):
+            stats.add(i / 100)
+        summary = stats.to_dict()
+        self.assertEqual(summary["count"], 100)
+        self.assertAlmostEqual(summary["p50"], 0.51)
+        self.assertAlmostEqual(summary["max"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()